@@ -2109,7 +2109,7 @@ class EnhancedTriviaCog(commands.Cog):
                 difficulty=game_session.difficulty,
                 category=game_session.question.category
                 if hasattr(game_session, "question")
-                else "general",
+                else None,
             )
 
             # Check for achievements
@@ -250,7 +250,7 @@ class TestDatabaseInfrastructure:
 
         assert stats["users_count"] == 2
         assert stats["questions_count"] == 1
-        assert stats["schema_version"] == 1
+        assert stats["schema_version"] == 7
         assert stats["database_size_bytes"] > 0
 
         await self.db_manager.close_all_connections()
@@ -246,6 +246,24 @@ class TestEnhancedScoringEngine:
         assert any("Streak bonus (6 streak): +10" in item for item in breakdown)
         assert any("Total:" in item for item in breakdown)
 
+    def test_breakdown_can_be_skipped(self, scoring_engine):
+        """Test that skipping the breakdown leaves the score unchanged."""
+        kwargs = dict(
+            difficulty="hard",
+            is_correct=True,
+            time_taken=3.0,
+            current_streak=6,
+            user_accuracy=75.0,
+            is_challenge=True,
+        )
+        full = scoring_engine.calculate_total_score(**kwargs)
+        quiet = scoring_engine.calculate_total_score(**kwargs, include_breakdown=False)
+
+        assert quiet["breakdown"] == []
+        assert {k: v for k, v in quiet.items() if k != "breakdown"} == {
+            k: v for k, v in full.items() if k != "breakdown"
+        }
+
     def test_streak_achievements_checking(self, scoring_engine):
         """Test streak achievement checking."""
         # Test no achievements for low streaks
@@ -466,6 +484,29 @@ class TestEnhancedScoringEngine:
         assert challenge["challenge_multiplier"] == 2.0
         assert challenge["total_points"] == regular["total_points"] * 2
 
+    def test_total_score_truncation_matches_exact_arithmetic(self, scoring_engine):
+        """Test that float multipliers never truncate below the exact product."""
+        for difficulty in ("easy", "medium", "hard"):
+            for time_taken in (3.0, 8.0, 15.0, 25.0):
+                for accuracy in (50.0, 75.0, 85.0):
+                    for is_challenge in (False, True):
+                        result = scoring_engine.calculate_total_score(
+                            difficulty=difficulty,
+                            is_correct=True,
+                            time_taken=time_taken,
+                            current_streak=0,
+                            user_accuracy=accuracy,
+                            is_challenge=is_challenge,
+                        )
+                        # Multipliers are whole tenths, so scale them to integers
+                        exact = (
+                            result["base_points"]
+                            * round(result["time_bonus_multiplier"] * 10)
+                            * round(result["difficulty_bonus_multiplier"] * 10)
+                            * round(result["challenge_multiplier"] * 10)
+                        ) // 1000
+                        assert result["total_points"] == exact
+
     def test_error_handling_in_analytics(self, scoring_engine):
         """Test error handling in analytics calculations."""
         # Test with malformed data
@@ -4,6 +4,7 @@ Tests for the Game Manager system.
 
 import pytest
 import asyncio
+from datetime import datetime, timedelta
 from unittest.mock import Mock, AsyncMock, patch
 from utils.game_manager import GameManager
 from utils.question_engine import QuestionEngine
@@ -278,6 +279,53 @@ class TestGameManager:
         assert stats["games_by_type"]["regular"] == 1
         assert stats["games_by_type"]["challenge"] == 1
 
+    def test_stats_snapshot_shared_with_health(self):
+        """Test that stats and health checks share one cached game scan."""
+        game = GameSession(channel_id=12345, user_id=67890, difficulty="easy")
+        game.start_time = datetime.now() - timedelta(minutes=20)
+        self.game_manager.active_games[12345] = game
+
+        with patch.object(
+            self.game_manager,
+            "_compute_snapshot",
+            wraps=self.game_manager._compute_snapshot,
+        ) as compute:
+            stats = self.game_manager.get_game_stats()
+            health = self.game_manager.get_health_status()
+
+            assert compute.call_count == 1
+            assert stats["game_durations"]["min_seconds"] >= 1200
+            assert "1 potentially stuck games" in health["issues"]
+
+            # Callers cannot modify the cached snapshot
+            with pytest.raises(TypeError):
+                self.game_manager._maybe_cached_snapshot()["stuck_games"] = 0
+
+            # Invalidating the snapshot forces a fresh scan
+            self.game_manager._snapshot_ts = None
+            self.game_manager.get_game_stats()
+            assert compute.call_count == 2
+
+    def test_record_error_resets_after_an_hour(self):
+        """Test that the error count restarts once the last error is stale."""
+        for _ in range(3):
+            self.game_manager._record_error("test_error")
+        assert self.game_manager._error_count == 3
+
+        self.game_manager._last_error_time = datetime.now() - timedelta(hours=2)
+        assert self.game_manager._recent_error_count() == 0
+
+        self.game_manager._record_error("test_error")
+        assert self.game_manager._error_count == 1
+
+    def test_health_reports_unscannable_games(self):
+        """Test that games whose duration cannot be read show up in health."""
+        game = GameSession(channel_id=12345, user_id=67890, difficulty="easy")
+        self.game_manager.active_games[12345] = game  # start_time is None
+
+        health = self.game_manager.get_health_status()
+        assert "1 games could not be checked" in health["issues"]
+
     @pytest.mark.asyncio
     async def test_cleanup_expired_games(self):
         """Test cleaning up expired games."""
@@ -287,6 +335,63 @@ class TestGameManager:
         assert isinstance(cleaned, int)
         assert cleaned >= 0
 
+    @pytest.mark.asyncio
+    async def test_cleanup_expired_games_from_heap(self):
+        """Test that the quick cleanup pass only acts on passed deadlines."""
+        test_question = Question(
+            id=1,
+            question_text="Test question?",
+            question_type="multiple_choice",
+            difficulty="medium",
+        )
+        self.question_engine.get_question = AsyncMock(return_value=test_question)
+
+        game = await self.game_manager.start_game(channel_id=12345, user_id=67890)
+        game.start_time = datetime.now() - timedelta(minutes=15)
+
+        # The deadline recorded at start has not passed yet
+        assert await self.game_manager.cleanup_expired_games(full_scan=False) == 0
+        assert 12345 in self.game_manager.active_games
+
+        # Once the recorded deadline passes, the game is popped and ended
+        self.game_manager._expiry_heap = [(0.0, 12345)]
+        assert await self.game_manager.cleanup_expired_games(full_scan=False) == 1
+        assert 12345 not in self.game_manager.active_games
+        assert self.game_manager._expiry_heap == []
+
+    @pytest.mark.asyncio
+    async def test_periodic_cleanup_runs_full_scan(self):
+        """Test that the 5-minute cleanup loop runs the full game scan."""
+        sleep = AsyncMock(side_effect=[None, asyncio.CancelledError()])
+        with (
+            patch("utils.game_manager.asyncio.sleep", sleep),
+            patch.object(
+                self.game_manager, "cleanup_expired_games", AsyncMock(return_value=0)
+            ) as cleanup,
+        ):
+            await self.game_manager._periodic_cleanup()
+
+        sleep.assert_awaited_with(300)
+        cleanup.assert_awaited_once_with()
+
+    @pytest.mark.asyncio
+    async def test_game_timer_sleeps_between_checkpoints(self):
+        """Test that the game timer only wakes for countdowns and checks."""
+        game = GameSession(channel_id=12345, user_id=67890, difficulty="easy")
+        self.game_manager.active_games[12345] = game
+        countdown = AsyncMock()
+        self.game_manager.countdown_callbacks[12345] = countdown
+
+        with patch("utils.game_manager.asyncio.sleep", new=AsyncMock()) as sleep:
+            with patch.object(
+                self.game_manager, "end_game", new=AsyncMock()
+            ) as end_game:
+                await self.game_manager._game_timer_task(12345, 30)
+
+        assert [call.args[0] for call in sleep.await_args_list] == [10, 10, 10]
+        assert [call.args[0] for call in countdown.await_args_list] == [20, 10]
+        end_game.assert_awaited_once_with(12345, reason="timeout")
+
     @pytest.mark.asyncio
     async def test_shutdown(self):
         """Test shutting down the game manager."""
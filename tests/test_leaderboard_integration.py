@@ -18,6 +18,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
 from utils.leaderboard_manager import LeaderboardManager
 from utils.database import DatabaseManager
+from utils.migrations import MigrationManager
 from utils.user_manager import UserManager
 from utils.models import UserProfile, LeaderboardEntry
 from cogs.leaderboard_commands import LeaderboardCommands
@@ -160,6 +161,118 @@ class TestLeaderboardManager:
         weekly_rank = await leaderboard_manager.get_user_rank(1001, "weekly")
         assert weekly_rank is not None
 
+    @pytest.mark.asyncio
+    async def test_weekly_rankings_refresh_throttled(self, setup_test_db):
+        """Test that weekly reads only recompute rankings when stale."""
+        db_manager, db_path = setup_test_db
+
+        leaderboard_manager = LeaderboardManager()
+        leaderboard_manager.db_manager = db_manager
+
+        with patch.object(
+            leaderboard_manager,
+            "_update_weekly_rankings",
+            wraps=leaderboard_manager._update_weekly_rankings,
+        ) as update:
+            await leaderboard_manager.get_leaderboard("weekly", limit=5)
+            await leaderboard_manager.get_user_rank(1001, "weekly")
+            assert update.call_count == 1
+
+            # An explicit invalidation forces the next read to recompute
+            leaderboard_manager.invalidate("weekly")
+            await leaderboard_manager.get_user_rank(1001, "weekly")
+            assert update.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_period_points_rollup(self, setup_test_db):
+        """Test that session writes keep the weekly/monthly rollup in sync."""
+        db_manager, db_path = setup_test_db
+
+        leaderboard_manager = LeaderboardManager()
+        leaderboard_manager.db_manager = db_manager
+
+        async with db_manager.get_connection() as conn:
+            await conn.execute(
+                """
+                INSERT INTO questions (question_text, question_type, difficulty, category, correct_answer)
+                VALUES ('Hard question', 'multiple_choice', 'hard', 'general', 'answer')
+                """
+            )
+            for user_id in (1001, 1001, 1002):
+                await conn.execute(
+                    """
+                    INSERT INTO game_sessions (channel_id, user_id, question_id, is_completed, end_time)
+                    VALUES (?, ?, 1, 1, ?)
+                    """,
+                    (12345, user_id, datetime.now()),
+                )
+            # Unfinished sessions do not count until they complete
+            await conn.execute(
+                """
+                INSERT INTO game_sessions (channel_id, user_id, question_id, is_completed, end_time)
+                VALUES (?, ?, 1, 0, ?)
+                """,
+                (12345, 1003, datetime.now()),
+            )
+            await conn.commit()
+
+        entries = await leaderboard_manager.get_leaderboard("monthly", limit=5)
+        assert [(e.user_id, e.total_points) for e in entries] == [
+            (1001, 60),
+            (1002, 30),
+        ]
+        assert await leaderboard_manager.get_user_rank(1002, "monthly") == (2, 2)
+
+        async with db_manager.get_connection() as conn:
+            await conn.execute(
+                "UPDATE game_sessions SET is_completed = 1 WHERE user_id = 1003"
+            )
+            await conn.execute("DELETE FROM game_sessions WHERE user_id = 1001")
+            await conn.commit()
+
+        assert await leaderboard_manager.get_user_rank(1001, "monthly") is None
+        leaderboard_manager.invalidate("monthly")
+        entries = await leaderboard_manager.get_leaderboard("monthly", limit=5)
+        assert sorted((e.user_id, e.total_points) for e in entries) == [
+            (1002, 30),
+            (1003, 30),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_period_points_migration_backfill(self, setup_test_db):
+        """Test that the v2 migration rebuilds the rollup from game sessions."""
+        db_manager, db_path = setup_test_db
+
+        async with db_manager.get_connection() as conn:
+            await conn.execute(
+                """
+                INSERT INTO questions (question_text, question_type, difficulty, category, correct_answer)
+                VALUES ('Easy question', 'multiple_choice', 'easy', 'general', 'answer')
+                """
+            )
+            await conn.execute(
+                """
+                INSERT INTO game_sessions (channel_id, user_id, question_id, is_completed, end_time)
+                VALUES (?, ?, 1, 1, ?)
+                """,
+                (12345, 1001, datetime(2024, 3, 14, 12, 0)),
+            )
+            await conn.execute("DELETE FROM user_period_points")
+            await conn.commit()
+
+            await MigrationManager(db_manager)._migrate_to_v2(conn)
+            await conn.commit()
+
+            cursor = await conn.execute(
+                """
+                SELECT period_type, period_start, points FROM user_period_points
+                WHERE user_id = 1001 ORDER BY period_type
+                """
+            )
+            rows = await cursor.fetchall()
+
+        assert rows == [("month", "2024-03-01", 10), ("week", "2024-03-11", 10)]
+
     @pytest.mark.asyncio
     async def test_nearby_ranks(self, setup_test_db):
         """Test getting nearby ranks functionality."""
@@ -204,6 +317,80 @@ class TestLeaderboardManager:
         entries3 = await leaderboard_manager.get_leaderboard("all_time", limit=5)
         assert len(entries3) == len(entries1)
 
+    @pytest.mark.asyncio
+    async def test_leaderboard_cache_invalidation(self, setup_test_db):
+        """Test that invalidating a period refreshes only that period."""
+        db_manager, db_path = setup_test_db
+
+        leaderboard_manager = LeaderboardManager()
+        leaderboard_manager.db_manager = db_manager
+
+        await leaderboard_manager.get_leaderboard("all_time", limit=5)
+        await leaderboard_manager.get_leaderboard("monthly", limit=5)
+
+        async with db_manager.get_connection() as conn:
+            await conn.execute(
+                "UPDATE users SET total_points = 5000 WHERE user_id = 1004"
+            )
+            await conn.commit()
+
+        # Cached page is still served until the period is invalidated
+        entries = await leaderboard_manager.get_leaderboard("all_time", limit=5)
+        assert entries[0].user_id == 1003
+
+        leaderboard_manager.invalidate("all_time")
+        assert ("monthly", 5, 0) in leaderboard_manager._cache
+
+        entries = await leaderboard_manager.get_leaderboard("all_time", limit=5)
+        assert entries[0].user_id == 1004
+
+        leaderboard_manager.invalidate()
+        assert not leaderboard_manager._cache
+
+    @pytest.mark.asyncio
+    async def test_user_context_outside_page(self, setup_test_db):
+        """Test that the context user's row is appended without being cached."""
+        db_manager, db_path = setup_test_db
+
+        leaderboard_manager = LeaderboardManager()
+        leaderboard_manager.db_manager = db_manager
+
+        entries = await leaderboard_manager.get_leaderboard(
+            "all_time", limit=2, user_context=1004
+        )
+        assert [(e.user_id, e.rank) for e in entries] == [
+            (1003, 1),
+            (1001, 2),
+            (1004, 5),
+        ]
+
+        # The cached page holds only the requested window
+        entries = await leaderboard_manager.get_leaderboard("all_time", limit=2)
+        assert [e.user_id for e in entries] == [1003, 1001]
+
+    @pytest.mark.asyncio
+    async def test_user_position_single_query(self, setup_test_db):
+        """Test that the context entry is built without a separate rank lookup."""
+        db_manager, db_path = setup_test_db
+
+        leaderboard_manager = LeaderboardManager()
+        leaderboard_manager.db_manager = db_manager
+
+        with patch.object(leaderboard_manager, "get_user_rank") as get_user_rank:
+            async with db_manager.get_connection() as conn:
+                entry = await leaderboard_manager._get_user_position(
+                    conn, 1002, "all_time"
+                )
+                missing = await leaderboard_manager._get_user_position(
+                    conn, 1002, "monthly"
+                )
+
+        get_user_rank.assert_not_called()
+        assert entry.rank == 4
+        assert entry.total_points == 800
+        assert entry.accuracy_percentage == 80.0
+        assert missing is None
+
     @pytest.mark.asyncio
     async def test_pagination(self, setup_test_db):
         """Test leaderboard pagination."""
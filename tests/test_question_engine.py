@@ -6,6 +6,7 @@ Tests question selection, validation, and formatting functionality.
 import pytest
 import asyncio
 from datetime import date
+from unittest.mock import patch
 from utils.question_engine import QuestionEngine
 from utils.models import Question
 
@@ -121,6 +122,42 @@ class TestQuestionEngine:
             for q1, q2 in zip(questions1, questions2):
                 assert q1.id == q2.id
 
+    @pytest.mark.asyncio
+    async def test_weekly_challenge_week_start_crosses_month(self, question_engine):
+        """Test the weekly key when the week started in the previous month."""
+
+        class FixedDate(date):
+            @classmethod
+            def today(cls):
+                return cls(2024, 5, 1)  # A Wednesday
+
+        with patch("utils.question_engine.date", FixedDate):
+            questions = await question_engine.get_weekly_challenge_questions()
+
+        assert questions
+        assert "2024-04-29" in question_engine._weekly_challenge_cache
+
+    @pytest.mark.asyncio
+    async def test_weekly_challenge_questions_are_distinct(self, question_engine):
+        """Test that the weekly challenge never repeats a question."""
+        questions = await question_engine.get_weekly_challenge_questions()
+
+        assert len(questions) == 5
+        assert len({(q.difficulty, q.id) for q in questions}) == 5
+        assert [q.difficulty for q in questions] == ["medium"] * 2 + ["hard"] * 3
+
+    @pytest.mark.asyncio
+    async def test_daily_challenge_cache_keeps_only_today(self, question_engine):
+        """Test that older daily challenge entries are dropped on a new day."""
+        question_engine._daily_challenge_cache["2000-01-01"] = Question(id=1)
+
+        question = await question_engine.get_daily_challenge_question()
+
+        assert question is not None
+        assert list(question_engine._daily_challenge_cache) == [
+            date.today().isoformat()
+        ]
+
     def test_validate_multiple_choice_answer_by_index(
         self, question_engine, sample_multiple_choice_question
     ):
@@ -295,6 +332,19 @@ class TestQuestionEngine:
         result = await question_engine.add_custom_question(question_data)
         assert result is True
 
+        # The new question is immediately reachable through the filter index
+        question = await question_engine.get_question(
+            difficulty="hard", question_type="multiple_choice", category="philosophy"
+        )
+        assert question is not None
+        assert question.question_text == "What is the answer to everything?"
+
+    @pytest.mark.asyncio
+    async def test_get_question_after_pool_replaced(self, question_engine):
+        """Test that replacing the question pool rebuilds the filter index."""
+        question_engine._questions_cache = {"easy": [], "medium": [], "hard": []}
+        assert await question_engine.get_question(difficulty="easy") is None
+
     @pytest.mark.asyncio
     async def test_add_custom_question_invalid(self, question_engine):
         """Test adding invalid custom questions."""
@@ -336,6 +386,24 @@ class TestQuestionEngine:
             assert difficulty in stats["by_difficulty"]
             assert stats["by_difficulty"][difficulty] >= 0
 
+    @pytest.mark.asyncio
+    async def test_question_statistics_refresh_after_add(self, question_engine):
+        """Test that cached statistics pick up newly added questions."""
+        before = question_engine.get_question_statistics()["total_questions"]
+
+        await question_engine.add_custom_question(
+            {
+                "question": "Is this a new question?",
+                "question_type": "true_false",
+                "difficulty": "easy",
+                "correct_answer": True,
+            }
+        )
+
+        stats = question_engine.get_question_statistics()
+        assert stats["total_questions"] == before + 1
+        assert stats is question_engine.get_question_statistics()
+
     def test_clear_caches(self, question_engine):
         """Test clearing daily and weekly caches."""
         # These should not raise exceptions
@@ -220,6 +220,25 @@ class TestScoringEngine:
             in analytics["improvement_suggestions"]
         )
 
+    def test_performance_analytics_uses_overall_accuracy(self, scoring_engine):
+        """Test that a weak difficulty does not mask good overall accuracy."""
+        user_stats = {
+            "accuracy_percentage": 85.0,
+            "difficulty_breakdown": {
+                "easy": {"total": 20, "correct": 19},
+                "hard": {"total": 4, "correct": 2},
+            },
+            "user_profile": {"questions_answered": 24, "current_streak": 5},
+        }
+
+        analytics = scoring_engine.calculate_performance_analytics(user_stats)
+
+        assert analytics["weakest_difficulty"] == "hard"
+        assert (
+            "Focus on easier questions to build confidence"
+            not in analytics["improvement_suggestions"]
+        )
+
     def test_get_next_milestone_suggestion_streak(self, scoring_engine):
         """Test milestone suggestions for streak achievements."""
         user_stats = {
@@ -230,6 +249,11 @@ class TestScoringEngine:
         suggestion = scoring_engine.get_next_milestone_suggestion(user_stats)
         assert "2 more correct answers for Hot Streak" in suggestion
 
+        # Exactly at one threshold points at the next one
+        user_stats["user_profile"]["current_streak"] = 5
+        suggestion = scoring_engine.get_next_milestone_suggestion(user_stats)
+        assert "5 more correct answers for Galaxy Expert" in suggestion
+
     def test_get_next_milestone_suggestion_total_correct(self, scoring_engine):
         """Test milestone suggestions for total correct achievements."""
         user_stats = {
@@ -122,6 +122,19 @@ class TestUserManager:
         assert updated_user.best_streak == 2  # Best streak preserved
         assert updated_user.accuracy_percentage == pytest.approx(66.67, rel=1e-2)
 
+    @pytest.mark.asyncio
+    async def test_update_stats_returns_stored_profile(self, user_manager):
+        """Test that update_stats returns the row as stored in the database."""
+        user_id = 12345
+
+        await user_manager.update_stats(user_id, 30, True, "hard")
+        updated_user = await user_manager.update_stats(user_id, 0, False, "hard")
+        stored_user = await user_manager.get_or_create_user(user_id)
+
+        assert updated_user == stored_user
+        assert stored_user.preferred_difficulty == "medium"
+        assert stored_user.last_played is not None
+
     @pytest.mark.asyncio
     async def test_streak_tracking(self, user_manager):
         """Test streak tracking functionality."""
@@ -165,6 +178,19 @@ class TestUserManager:
         streak = await user_manager.update_streak(user_id, False)
         assert streak == 0
 
+        user = await user_manager.get_or_create_user(user_id)
+        assert user.best_streak == 2
+
+    @pytest.mark.asyncio
+    async def test_update_streak_creates_user(self, user_manager):
+        """Test that update_streak works for a user with no profile yet."""
+        streak = await user_manager.update_streak(54321, True)
+        assert streak == 1
+
+        user = await user_manager.get_or_create_user(54321)
+        assert user.current_streak == 1
+        assert user.best_streak == 1
+
     @pytest.mark.asyncio
     async def test_get_user_stats(self, user_manager):
         """Test getting comprehensive user statistics."""
@@ -183,6 +209,44 @@ class TestUserManager:
         assert stats.user_profile.questions_answered == 3
         assert stats.user_profile.questions_correct == 2
         assert stats.accuracy_percentage == pytest.approx(66.67, rel=1e-2)
+        assert stats.points_per_category == {"players": 10, "history": 20}
+        assert stats.difficulty_breakdown["hard"] == {
+            "total": 1,
+            "correct": 0,
+            "points": 0,
+            "accuracy": 0,
+        }
+        assert stats.difficulty_breakdown["medium"]["accuracy"] == 100
+        assert stats.recent_performance == [False, True, True]
+
+    @pytest.mark.asyncio
+    async def test_category_stats_count_base_question_points(self, user_manager):
+        """Test that breakdowns hold base points for categorised questions only."""
+        user_id = 12345
+
+        # 45 awarded with speed and streak bonuses on a 20 point question
+        await user_manager.update_stats(user_id, 45, True, "medium", "history")
+        await user_manager.update_stats(user_id, 300, True, "mixed", "challenge")
+        await user_manager.update_stats(user_id, 10, True, "easy")
+
+        stats = await user_manager.get_user_stats(user_id)
+        assert stats.user_profile.total_points == 355
+        assert stats.points_per_category == {"history": 20}
+        assert list(stats.difficulty_breakdown) == ["medium"]
+
+    @pytest.mark.asyncio
+    async def test_recent_performance_keeps_last_ten_answers(self, user_manager):
+        """Test that recent performance holds only the latest 10 answers."""
+        user_id = 12345
+        answers = [True, False, True, True, False, True, True, True, False, False]
+
+        await user_manager.update_stats(user_id, 0, False, "easy")
+        await user_manager.update_stats(user_id, 0, False, "easy")
+        for is_correct in answers:
+            await user_manager.update_stats(user_id, 0, is_correct, "easy")
+
+        stats = await user_manager.get_user_stats(user_id)
+        assert stats.recent_performance == answers[::-1]
 
     @pytest.mark.asyncio
     async def test_reset_user_stats(self, user_manager):
@@ -210,6 +274,11 @@ class TestUserManager:
         assert user_after.current_streak == 0
         assert user_after.best_streak == 0
 
+        stats_after = await user_manager.get_user_stats(user_id)
+        assert stats_after.points_per_category == {}
+        assert stats_after.difficulty_breakdown == {}
+        assert stats_after.recent_performance == []
+
     @pytest.mark.asyncio
     async def test_challenge_completion_daily(self, user_manager):
         """Test daily challenge completion tracking."""
@@ -250,6 +319,18 @@ class TestUserManager:
         can_attempt = await user_manager.can_attempt_challenge(user_id, "weekly")
         assert can_attempt is False
 
+    @pytest.mark.asyncio
+    async def test_challenge_completion_without_profile(self, user_manager):
+        """Test challenge tracking for a user who has no profile yet."""
+        user_id = 54321
+
+        assert await user_manager.can_attempt_challenge(user_id, "daily") is True
+        assert await user_manager.update_challenge_completion(user_id, "daily")
+        assert await user_manager.can_attempt_challenge(user_id, "daily") is False
+
+        user = await user_manager.get_or_create_user(user_id)
+        assert user.daily_challenge_completed == date.today()
+
     @pytest.mark.asyncio
     async def test_get_user_rank(self, user_manager):
         """Test getting user rank in leaderboard."""
@@ -288,6 +369,36 @@ class TestUserManager:
         assert rank_3 == 3
         assert rank_none is None  # Users with 0 points don't get ranked
 
+    @pytest.mark.asyncio
+    async def test_get_user_rank_refreshes_after_points_change(self, user_manager):
+        """Test that ranks follow points changes immediately."""
+        await user_manager.update_stats(12345, 30, True, "hard")
+        await user_manager.update_stats(12346, 20, True, "medium")
+        assert await user_manager.get_user_rank(12346) == 2
+
+        # Overtake the leader
+        await user_manager.update_stats(12346, 20, True, "medium")
+        assert await user_manager.get_user_rank(12346) == 1
+        assert await user_manager.get_user_rank(12345) == 2
+
+    @pytest.mark.asyncio
+    async def test_user_stats_rank_includes_achievement_rewards(
+        self, user_manager, temp_db
+    ):
+        """Test that achievement reward points show up in current_rank at once."""
+        from utils.achievement_system import AchievementSystem
+
+        await user_manager.update_stats(12345, 30, True, "hard")
+        await user_manager.update_stats(12346, 20, True, "medium")
+        assert (await user_manager.get_user_stats(12346)).current_rank == 2
+
+        # hot_streak awards 50 reward points, overtaking the leader
+        with patch("utils.achievement_system.db_manager", temp_db):
+            assert await AchievementSystem().unlock_achievement(12346, "hot_streak")
+
+        assert (await user_manager.get_user_stats(12346)).current_rank == 1
+        assert (await user_manager.get_user_stats(12345)).current_rank == 2
+
     @pytest.mark.asyncio
     async def test_get_user_preferences(self, user_manager):
         """Test getting user preferences and personalization data."""
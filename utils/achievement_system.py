@@ -12,6 +12,7 @@ from enum import Enum
 import json
 
 from .database import db_manager
+from .leaderboard_manager import leaderboard_manager
 
 logger = logging.getLogger(__name__)
 
@@ -504,6 +505,7 @@ class AchievementSystem:
                 )
 
                 await conn.commit()
+                leaderboard_manager.invalidate("all_time")
 
                 # Clear progress cache for this user
                 self._progress_cache.pop(user_id, None)
@@ -18,6 +18,31 @@ from functools import wraps
 
 logger = logging.getLogger(__name__)
 
+# Points awarded for a completed session, keyed on the joined question row `q`
+SESSION_POINTS_SQL = """CASE q.difficulty
+    WHEN 'easy' THEN 10
+    WHEN 'medium' THEN 20
+    WHEN 'hard' THEN 30
+    ELSE 0
+END"""
+
+# (index name, table, columns, partial-index condition) for the leaderboard reads
+LEADERBOARD_INDEXES = [
+    ("idx_users_points", "users", "total_points DESC", "total_points > 0"),
+    (
+        "idx_weekly_rankings_week_rank",
+        "weekly_rankings",
+        "week_start, rank",
+        None,
+    ),
+    (
+        "idx_user_period_points_ranking",
+        "user_period_points",
+        "period_type, period_start, points DESC",
+        None,
+    ),
+]
+
 
 class DatabaseError(Exception):
     """Base exception for database-related errors."""
@@ -89,13 +114,15 @@ class DatabaseManager:
 
     def __init__(self, db_path: str = "data/trivia.db"):
         self.db_path = db_path
-        self.schema_version = 1
+        self.schema_version = 7
         self._connection_pool = []
         self._pool_size = 10
+        self._warm_pool_size = 4  # connections opened up front at startup
         self._max_pool_size = 20
         self._pool_lock = asyncio.Lock()
         self._connection_timeout = 30.0
         self._busy_timeout = 30000  # 30 seconds in milliseconds
+        self._cached_statements = 256  # prepared statements kept per connection
 
         # Health monitoring
         self._last_integrity_check = None
@@ -122,7 +149,9 @@ class DatabaseManager:
         """Create a new database connection with proper configuration."""
         try:
             connection = await aiosqlite.connect(
-                self.db_path, timeout=self._connection_timeout
+                self.db_path,
+                timeout=self._connection_timeout,
+                cached_statements=self._cached_statements,
             )
 
             # Configure connection for optimal performance and reliability
@@ -206,13 +235,10 @@ class DatabaseManager:
         finally:
             if connection:
                 try:
-                    # Return connection to pool if it's still healthy and pool isn't full
+                    # Return connection to pool if the pool isn't full; it is
+                    # validated again when it is next taken from the pool
                     async with self._pool_lock:
-                        if len(
-                            self._connection_pool
-                        ) < self._pool_size and await self._validate_connection(
-                            connection
-                        ):
+                        if len(self._connection_pool) < self._pool_size:
                             self._connection_pool.append(connection)
                         else:
                             await connection.close()
@@ -260,6 +286,13 @@ class DatabaseManager:
                     f"Integrity check failed during error recovery: {integrity_error}"
                 )
 
+    async def _warm_connection_pool(self):
+        """Fill the pool with configured connections up to the warm size."""
+        async with self._pool_lock:
+            while len(self._connection_pool) < self._warm_pool_size:
+                self._connection_pool.append(await self._create_connection())
+        logger.debug(f"Connection pool warmed to {len(self._connection_pool)}")
+
     async def _clear_connection_pool(self):
         """Clear all connections from the pool."""
         async with self._pool_lock:
@@ -391,6 +424,9 @@ class DatabaseManager:
             # Perform initial integrity check
             await self.check_database_integrity()
 
+            # Open configured connections now so early requests reuse them
+            await self._warm_connection_pool()
+
             # Create initial backup if auto-backup is enabled
             if self._auto_backup_enabled and not self._last_backup:
                 try:
@@ -407,6 +443,9 @@ class DatabaseManager:
         """Handle corrupted database by attempting recovery."""
         logger.warning("Handling corrupted database")
 
+        # Pooled connections would keep pointing at the file being replaced
+        await self._clear_connection_pool()
+
         try:
             # Create backup of corrupted database for analysis
             corrupted_backup = f"{self.db_path}.corrupted_{int(time.time())}"
@@ -482,7 +521,8 @@ class DatabaseManager:
     async def _create_all_tables(self, conn: aiosqlite.Connection):
         """Create all required tables for the trivia system."""
 
-        # Users table
+        # Users table; recent_mask holds the last 10 answers, newest in bit 0,
+        # below a leading marker bit
         await conn.execute("""
             CREATE TABLE users (
                 user_id INTEGER PRIMARY KEY,
@@ -495,7 +535,8 @@ class DatabaseManager:
                 daily_challenge_completed DATE,
                 weekly_challenge_completed DATE,
                 preferred_difficulty TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                recent_mask INTEGER DEFAULT 1
             )
         """)
 
@@ -538,6 +579,9 @@ class DatabaseManager:
                 week_start DATE NOT NULL,
                 points INTEGER DEFAULT 0,
                 rank INTEGER,
+                questions_answered INTEGER DEFAULT 0,
+                questions_correct INTEGER DEFAULT 0,
+                current_streak INTEGER DEFAULT 0,
                 FOREIGN KEY (user_id) REFERENCES users (user_id) ON DELETE CASCADE,
                 UNIQUE(user_id, week_start)
             )
@@ -560,12 +604,119 @@ class DatabaseManager:
             )
         """)
 
+        # Per-period point rollups maintained from game_sessions
+        await self._create_period_points_table(conn)
+
+        # Per-category answer totals recorded with each answered question
+        await self._create_category_stats_table(conn)
+
         # Create indexes for better performance
         await self._create_indexes(conn)
 
         await conn.commit()
         logger.info("All database tables created successfully")
 
+    async def _create_period_points_table(self, conn: aiosqlite.Connection):
+        """
+        Create the user_period_points rollup table and the triggers that keep it
+        in sync with completed game sessions.
+
+        Each completed session adds its question's point value to the user's
+        row for the week (keyed by Monday) and month it ended in, so weekly and
+        monthly leaderboards never have to re-aggregate the session history.
+        Questions are treated as immutable once they have been answered.
+        """
+        await conn.execute("""
+            CREATE TABLE IF NOT EXISTS user_period_points (
+                user_id INTEGER NOT NULL,
+                period_type TEXT NOT NULL CHECK (period_type IN ('week', 'month')),
+                period_start DATE NOT NULL,
+                points INTEGER DEFAULT 0,
+                FOREIGN KEY (user_id) REFERENCES users (user_id) ON DELETE CASCADE,
+                PRIMARY KEY (period_type, period_start, user_id)
+            )
+        """)
+
+        add_points = """
+            INSERT INTO user_period_points (user_id, period_type, period_start, points)
+            SELECT NEW.user_id, 'week', DATE(NEW.end_time, '-6 days', 'weekday 1'),
+                   {points}
+            FROM questions q
+            WHERE q.id = NEW.question_id
+              AND NEW.is_completed = 1 AND NEW.end_time IS NOT NULL
+            ON CONFLICT (period_type, period_start, user_id)
+                DO UPDATE SET points = points + excluded.points;
+
+            INSERT INTO user_period_points (user_id, period_type, period_start, points)
+            SELECT NEW.user_id, 'month', DATE(NEW.end_time, 'start of month'),
+                   {points}
+            FROM questions q
+            WHERE q.id = NEW.question_id
+              AND NEW.is_completed = 1 AND NEW.end_time IS NOT NULL
+            ON CONFLICT (period_type, period_start, user_id)
+                DO UPDATE SET points = points + excluded.points;
+        """.format(points=SESSION_POINTS_SQL)
+
+        remove_points = """
+            UPDATE user_period_points
+            SET points = points - COALESCE(
+                (SELECT {points} FROM questions q WHERE q.id = OLD.question_id), 0
+            )
+            WHERE OLD.is_completed = 1 AND OLD.end_time IS NOT NULL
+              AND user_id = OLD.user_id
+              AND (
+                  (period_type = 'week'
+                   AND period_start = DATE(OLD.end_time, '-6 days', 'weekday 1'))
+                  OR (period_type = 'month'
+                      AND period_start = DATE(OLD.end_time, 'start of month'))
+              );
+        """.format(points=SESSION_POINTS_SQL)
+
+        await conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_game_sessions_points_insert
+            AFTER INSERT ON game_sessions
+            BEGIN
+                {add_points}
+            END
+        """)
+        await conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_game_sessions_points_update
+            AFTER UPDATE OF user_id, question_id, end_time, is_completed
+            ON game_sessions
+            BEGIN
+                {remove_points}
+                {add_points}
+            END
+        """)
+        await conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_game_sessions_points_delete
+            AFTER DELETE ON game_sessions
+            BEGIN
+                {remove_points}
+            END
+        """)
+
+    async def _create_category_stats_table(self, conn: aiosqlite.Connection):
+        """
+        Create the user_category_stats table.
+
+        UserManager.update_stats adds every answer to the row for its category
+        and difficulty, so profile breakdowns read a handful of rows instead of
+        re-aggregating the user's whole answer history.
+        """
+        await conn.execute("""
+            CREATE TABLE IF NOT EXISTS user_category_stats (
+                user_id INTEGER NOT NULL,
+                category TEXT NOT NULL,
+                difficulty TEXT NOT NULL,
+                answered INTEGER DEFAULT 0,
+                correct INTEGER DEFAULT 0,
+                points INTEGER DEFAULT 0,
+                FOREIGN KEY (user_id) REFERENCES users (user_id) ON DELETE CASCADE,
+                PRIMARY KEY (user_id, category, difficulty)
+            )
+        """)
+
     async def _create_indexes(self, conn: aiosqlite.Connection):
         """Create database indexes for better query performance."""
         indexes = [
@@ -579,8 +730,15 @@ class DatabaseManager:
             "CREATE INDEX IF NOT EXISTS idx_weekly_rankings_points ON weekly_rankings (points DESC)",
             "CREATE INDEX IF NOT EXISTS idx_game_sessions_channel_id ON game_sessions (channel_id)",
             "CREATE INDEX IF NOT EXISTS idx_game_sessions_active ON game_sessions (is_completed, start_time)",
+            "CREATE INDEX IF NOT EXISTS idx_game_sessions_user_end ON game_sessions (user_id, end_time, is_completed, question_id)",
         ]
 
+        for index_name, table, columns, where in LEADERBOARD_INDEXES:
+            indexes.append(
+                f"CREATE INDEX IF NOT EXISTS {index_name} ON {table} ({columns})"
+                + (f" WHERE {where}" if where else "")
+            )
+
         for index_sql in indexes:
             await conn.execute(index_sql)
 
@@ -588,9 +746,13 @@ class DatabaseManager:
 
     async def _run_migrations(self, conn: aiosqlite.Connection, current_version: int):
         """Run database migrations from current version to latest."""
-        # Future migrations will be implemented here
-        # For now, we only have version 1
-        if current_version < self.schema_version:
+        # Imported here because the migration module is built on top of this one
+        from utils.migrations import MigrationManager
+
+        await MigrationManager(self).run_migrations(
+            conn, current_version, self.schema_version
+        )
+        if await self._get_schema_version(conn) < self.schema_version:
             await self._set_schema_version(conn, self.schema_version)
 
     @retry_on_database_error(max_retries=2)
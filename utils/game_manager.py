@@ -5,9 +5,12 @@ Enhanced with comprehensive error handling, Discord permission management, and c
 """
 
 import asyncio
+import heapq
 import logging
+import time
 from datetime import datetime, timedelta
-from typing import Dict, Optional, Set, Any, Callable, Union, List
+from types import MappingProxyType
+from typing import Dict, Optional, Set, Any, Callable, Union, List, Mapping, Tuple
 from utils.models import GameSession, Question, AnswerResult
 from utils.question_engine import QuestionEngine
 from utils.answer_processor import AnswerProcessor
@@ -16,6 +19,24 @@ from functools import wraps
 
 logger = logging.getLogger(__name__)
 
+# Monitoring endpoints re-use the active-game scan for this many seconds
+_SNAPSHOT_TTL_SECONDS = 1.0
+
+# Games running longer than this are reported as potentially stuck
+_STUCK_GAME_DURATION = timedelta(minutes=15)
+
+# Games running longer than this are treated as expired (extended from 5 to 10 minutes)
+_MAX_GAME_DURATION = timedelta(minutes=10)
+
+# Errors older than this no longer count towards the hourly error rate
+_ERROR_WINDOW = timedelta(hours=1)
+
+# Send countdown notifications at these remaining seconds
+_COUNTDOWN_INTERVALS: frozenset[int] = frozenset({20, 10})
+
+# Longest a game timer sleeps between checks that the game is still valid
+_TIMER_CHECK_INTERVAL = 10
+
 
 class GameError(Exception):
     """Base exception for game-related errors."""
@@ -49,22 +70,22 @@ def handle_game_errors(func: Callable):
         try:
             return await func(self, *args, **kwargs)
         except discord.Forbidden as e:
-            logger.error(f"Discord permission error in {func.__name__}: {e}")
+            logger.error("Discord permission error in %s: %s", func.__name__, e)
             raise GamePermissionError(f"Missing Discord permissions: {e}")
         except discord.NotFound as e:
-            logger.warning(f"Discord resource not found in {func.__name__}: {e}")
+            logger.warning("Discord resource not found in %s: %s", func.__name__, e)
             # Clean up any related game state
             if hasattr(self, "_cleanup_on_not_found"):
                 await self._cleanup_on_not_found(args, kwargs)
             raise GameError(f"Discord resource not found: {e}")
         except discord.HTTPException as e:
-            logger.error(f"Discord HTTP error in {func.__name__}: {e}")
+            logger.error("Discord HTTP error in %s: %s", func.__name__, e)
             raise GameError(f"Discord communication error: {e}")
         except asyncio.CancelledError:
-            logger.debug(f"Operation cancelled in {func.__name__}")
+            logger.debug("Operation cancelled in %s", func.__name__)
             raise
         except Exception as e:
-            logger.error(f"Unexpected error in {func.__name__}: {e}", exc_info=True)
+            logger.error("Unexpected error in %s: %s", func.__name__, e, exc_info=True)
             raise GameError(f"Unexpected game error: {e}")
 
     return wrapper
@@ -99,6 +120,7 @@ class GameManager:
         self.countdown_callbacks: Dict[
             int, Callable
         ] = {}  # channel_id -> countdown callback
+        self._expiry_heap: List[Tuple[float, int]] = []  # (deadline, channel_id)
 
         # Concurrency control
         self._game_locks: Dict[int, asyncio.Lock] = {}  # channel_id -> lock
@@ -112,6 +134,11 @@ class GameManager:
         self._channel_check_interval = timedelta(minutes=30)
         self._last_channel_check: Optional[datetime] = None
 
+        # Cached active-game scan shared by get_game_stats and get_health_status
+        self._snapshot: Mapping[str, Any] = MappingProxyType({})
+        self._snapshot_ts: Optional[float] = None
+        self._iso_cache: Dict[str, Tuple[datetime, str]] = {}  # name -> (value, iso)
+
         # Cleanup and maintenance
         self._cleanup_task: Optional[asyncio.Task] = None
         self._maintenance_task: Optional[asyncio.Task] = None
@@ -145,7 +172,7 @@ class GameManager:
         try:
             channel = self.bot.get_channel(channel_id)
             if not channel:
-                logger.warning(f"Channel {channel_id} not found")
+                logger.warning("Channel %s not found", channel_id)
                 return False
 
             # Check required permissions
@@ -164,34 +191,46 @@ class GameManager:
 
             if missing_perms:
                 logger.warning(
-                    f"Missing permissions in channel {channel_id}: {missing_perms}"
+                    "Missing permissions in channel %s: %s", channel_id, missing_perms
                 )
                 return False
 
             return True
 
         except Exception as e:
-            logger.error(f"Error checking permissions for channel {channel_id}: {e}")
+            logger.error("Error checking permissions for channel %s: %s", channel_id, e)
             return False
 
     def _record_error(self, error_type: str = "general"):
         """Record an error for monitoring and rate limiting."""
         current_time = datetime.now()
-        self._error_count += 1
-        self._last_error_time = current_time
 
-        # Reset error count if it's been more than an hour
-        if self._last_error_time and current_time - self._last_error_time > timedelta(
-            hours=1
+        # Start a new count if the previous error was more than an hour ago
+        if (
+            self._last_error_time
+            and current_time - self._last_error_time > _ERROR_WINDOW
         ):
-            self._error_count = 1
+            self._error_count = 0
+
+        self._error_count += 1
+        self._last_error_time = current_time
 
         # Log warning if error rate is high
         if self._error_count > self._max_errors_per_hour / 2:
             logger.warning(
-                f"High error rate detected: {self._error_count} errors in the last hour"
+                "High error rate detected: %s errors in the last hour",
+                self._error_count,
             )
 
+    def _recent_error_count(self) -> int:
+        """Get the error count, treating errors older than an hour as expired."""
+        if (
+            self._last_error_time
+            and datetime.now() - self._last_error_time > _ERROR_WINDOW
+        ):
+            return 0
+        return self._error_count
+
     async def _cleanup_on_not_found(self, args, kwargs):
         """Clean up game state when Discord resources are not found."""
         # Extract channel_id from args if possible
@@ -202,7 +241,9 @@ class GameManager:
             channel_id = kwargs["channel_id"]
 
         if channel_id:
-            logger.info(f"Cleaning up game state for inaccessible channel {channel_id}")
+            logger.info(
+                "Cleaning up game state for inaccessible channel %s", channel_id
+            )
             self._inaccessible_channels.add(channel_id)
             await self._cleanup_game(channel_id)
 
@@ -216,26 +257,27 @@ class GameManager:
 
             # Check if game has required attributes
             if not hasattr(game_session, "question") or not game_session.question:
-                logger.warning(f"Game in channel {channel_id} missing question data")
+                logger.warning("Game in channel %s missing question data", channel_id)
                 return False
 
             # Check if channel is accessible
             if channel_id in self._inaccessible_channels:
-                logger.warning(f"Channel {channel_id} marked as inaccessible")
+                logger.warning("Channel %s marked as inaccessible", channel_id)
                 return False
 
             # Check if game has been running too long
-            max_duration = timedelta(minutes=10)  # Extended from 5 to 10 minutes
-            if datetime.now() - game_session.start_time > max_duration:
+            if datetime.now() - game_session.start_time > _MAX_GAME_DURATION:
                 logger.warning(
-                    f"Game in channel {channel_id} has been running too long"
+                    "Game in channel %s has been running too long", channel_id
                 )
                 return False
 
             return True
 
         except Exception as e:
-            logger.error(f"Error validating game state for channel {channel_id}: {e}")
+            logger.error(
+                "Error validating game state for channel %s: %s", channel_id, e
+            )
             return False
 
     def _start_cleanup_task(self) -> None:
@@ -306,7 +348,7 @@ class GameManager:
                     else:
                         # Clean up invalid game state
                         logger.info(
-                            f"Cleaning up invalid game state in channel {channel_id}"
+                            "Cleaning up invalid game state in channel %s", channel_id
                         )
                         await self._cleanup_game(channel_id)
 
@@ -321,7 +363,7 @@ class GameManager:
                             "Please try again or contact an administrator."
                         )
                 except Exception as e:
-                    logger.error(f"Failed to get question: {e}")
+                    logger.error("Failed to get question: %s", e)
                     raise GameError(
                         "Failed to load trivia question. Please try again in a moment."
                     )
@@ -343,6 +385,14 @@ class GameManager:
 
                 # Store the game session
                 self.active_games[channel_id] = game_session
+                self._snapshot_ts = None
+                heapq.heappush(
+                    self._expiry_heap,
+                    (
+                        (game_session.start_time + _MAX_GAME_DURATION).timestamp(),
+                        channel_id,
+                    ),
+                )
 
                 # Store callbacks with error handling wrappers
                 if timeout_callback:
@@ -364,8 +414,10 @@ class GameManager:
                 self._inaccessible_channels.discard(channel_id)
 
                 logger.info(
-                    f"Started game in channel {channel_id} for user {user_id} "
-                    f"with difficulty {question.difficulty}"
+                    "Started game in channel %s for user %s with difficulty %s",
+                    channel_id,
+                    user_id,
+                    question.difficulty,
                 )
                 return game_session
 
@@ -375,7 +427,9 @@ class GameManager:
             except Exception as e:
                 self._record_error("start_game")
                 logger.error(
-                    f"Unexpected error starting game in channel {channel_id}: {e}",
+                    "Unexpected error starting game in channel %s: %s",
+                    channel_id,
+                    e,
                     exc_info=True,
                 )
                 # Cleanup on error
@@ -389,13 +443,17 @@ class GameManager:
             try:
                 return await callback(*args, **kwargs)
             except discord.Forbidden as e:
-                logger.error(f"Permission error in {callback_type} callback: {e}")
+                logger.error("Permission error in %s callback: %s", callback_type, e)
                 # Don't re-raise, just log the error
             except discord.NotFound as e:
-                logger.warning(f"Resource not found in {callback_type} callback: {e}")
+                logger.warning(
+                    "Resource not found in %s callback: %s", callback_type, e
+                )
                 # Don't re-raise, just log the error
             except Exception as e:
-                logger.error(f"Error in {callback_type} callback: {e}", exc_info=True)
+                logger.error(
+                    "Error in %s callback: %s", callback_type, e, exc_info=True
+                )
                 # Don't re-raise callback errors to avoid breaking game flow
 
         return wrapped_callback
@@ -427,13 +485,13 @@ class GameManager:
             try:
                 # Check if there's an active game in this channel
                 if channel_id not in self.active_games:
-                    logger.debug(f"No active game in channel {channel_id}")
+                    logger.debug("No active game in channel %s", channel_id)
                     return None
 
                 # Validate game state
                 if not await self._validate_game_state(channel_id):
                     logger.warning(
-                        f"Invalid game state in channel {channel_id}, cleaning up"
+                        "Invalid game state in channel %s, cleaning up", channel_id
                     )
                     await self._cleanup_game(channel_id)
                     return None
@@ -446,7 +504,9 @@ class GameManager:
                     game_session.question, emoji_str
                 ):
                     logger.debug(
-                        f"Invalid reaction {emoji_str} for question type {game_session.question.question_type}"
+                        "Invalid reaction %s for question type %s",
+                        emoji_str,
+                        game_session.question.question_type,
                     )
                     return None
 
@@ -459,10 +519,10 @@ class GameManager:
                     )
 
                     if processed_answer is None:
-                        logger.debug(f"Could not process reaction answer: {emoji_str}")
+                        logger.debug("Could not process reaction answer: %s", emoji_str)
                         return None
                 except Exception as e:
-                    logger.error(f"Error processing reaction answer: {e}")
+                    logger.error("Error processing reaction answer: %s", e)
                     raise GameError("Failed to process your answer. Please try again.")
 
                 # Validate and calculate result
@@ -476,7 +536,9 @@ class GameManager:
             except Exception as e:
                 self._record_error("process_reaction")
                 logger.error(
-                    f"Unexpected error processing reaction answer in channel {channel_id}: {e}",
+                    "Unexpected error processing reaction answer in channel %s: %s",
+                    channel_id,
+                    e,
                     exc_info=True,
                 )
                 # Clean up potentially corrupted game state
@@ -508,13 +570,13 @@ class GameManager:
             try:
                 # Check if there's an active game in this channel
                 if channel_id not in self.active_games:
-                    logger.debug(f"No active game in channel {channel_id}")
+                    logger.debug("No active game in channel %s", channel_id)
                     return None
 
                 # Validate game state
                 if not await self._validate_game_state(channel_id):
                     logger.warning(
-                        f"Invalid game state in channel {channel_id}, cleaning up"
+                        "Invalid game state in channel %s, cleaning up", channel_id
                     )
                     await self._cleanup_game(channel_id)
                     return None
@@ -529,11 +591,11 @@ class GameManager:
 
                     if processed_answer is None:
                         logger.debug(
-                            f"Could not process text answer: {message.content}"
+                            "Could not process text answer: %s", message.content
                         )
                         return None
                 except Exception as e:
-                    logger.error(f"Error processing text answer: {e}")
+                    logger.error("Error processing text answer: %s", e)
                     raise GameError("Failed to process your answer. Please try again.")
 
                 # Validate and calculate result
@@ -547,7 +609,9 @@ class GameManager:
             except Exception as e:
                 self._record_error("process_text")
                 logger.error(
-                    f"Unexpected error processing text answer in channel {channel_id}: {e}",
+                    "Unexpected error processing text answer in channel %s: %s",
+                    channel_id,
+                    e,
                     exc_info=True,
                 )
                 # Clean up potentially corrupted game state
@@ -586,7 +650,7 @@ class GameManager:
                     game_session.question, processed_answer
                 )
             except Exception as e:
-                logger.error(f"Error validating answer: {e}")
+                logger.error("Error validating answer: %s", e)
                 # Default to incorrect if validation fails
                 is_correct = False
 
@@ -602,7 +666,7 @@ class GameManager:
                     points_earned = int(base_points * (1 - time_penalty))
                     points_earned = max(1, points_earned)  # Minimum 1 point
                 except Exception as e:
-                    logger.error(f"Error calculating points: {e}")
+                    logger.error("Error calculating points: %s", e)
                     points_earned = 1  # Default to 1 point
 
             # Create answer result
@@ -617,20 +681,25 @@ class GameManager:
             try:
                 await self.end_game(channel_id, reason="answered")
             except Exception as e:
-                logger.error(f"Error ending game after answer: {e}")
+                logger.error("Error ending game after answer: %s", e)
                 # Still return the result even if cleanup fails
                 await self._cleanup_game(channel_id)
 
             logger.info(
-                f"Processed answer in channel {channel_id}: "
-                f"user {user_id}, correct: {is_correct}, points: {points_earned}"
+                "Processed answer in channel %s: user %s, correct: %s, points: %s",
+                channel_id,
+                user_id,
+                is_correct,
+                points_earned,
             )
             return result
 
         except Exception as e:
             self._record_error("process_validated_answer")
             logger.error(
-                f"Error processing validated answer in channel {channel_id}: {e}",
+                "Error processing validated answer in channel %s: %s",
+                channel_id,
+                e,
                 exc_info=True,
             )
             # Ensure game is cleaned up even on error
@@ -651,7 +720,7 @@ class GameManager:
         async with channel_lock:
             try:
                 if channel_id not in self.active_games:
-                    logger.debug(f"No active game to end in channel {channel_id}")
+                    logger.debug("No active game to end in channel %s", channel_id)
                     return
 
                 game_session = self.active_games[channel_id]
@@ -661,9 +730,9 @@ class GameManager:
                     game_session.end_time = datetime.now()
                     game_session.is_completed = True
                 except Exception as e:
-                    logger.warning(f"Error updating game session state: {e}")
+                    logger.warning("Error updating game session state: %s", e)
 
-                logger.info(f"Ending game in channel {channel_id}, reason: {reason}")
+                logger.info("Ending game in channel %s, reason: %s", channel_id, reason)
 
                 # Cleanup the game resources
                 await self._cleanup_game(channel_id)
@@ -671,13 +740,13 @@ class GameManager:
             except Exception as e:
                 self._record_error("end_game")
                 logger.error(
-                    f"Error ending game in channel {channel_id}: {e}", exc_info=True
+                    "Error ending game in channel %s: %s", channel_id, e, exc_info=True
                 )
                 # Force cleanup even if there were errors
                 try:
                     await self._cleanup_game(channel_id)
                 except Exception as cleanup_error:
-                    logger.error(f"Error during force cleanup: {cleanup_error}")
+                    logger.error("Error during force cleanup: %s", cleanup_error)
 
     async def force_end_all_games(self, reason: str = "shutdown") -> int:
         """
@@ -697,10 +766,10 @@ class GameManager:
                 await self.end_game(channel_id, reason)
                 ended_count += 1
             except Exception as e:
-                logger.error(f"Error force ending game in channel {channel_id}: {e}")
+                logger.error("Error force ending game in channel %s: %s", channel_id, e)
                 # Continue with other games even if one fails
 
-        logger.info(f"Force ended {ended_count} games, reason: {reason}")
+        logger.info("Force ended %s games, reason: %s", ended_count, reason)
         return ended_count
 
     async def get_active_game(self, channel_id: int) -> Optional[GameSession]:
@@ -748,19 +817,56 @@ class GameManager:
             return True
         return False
 
-    async def cleanup_expired_games(self) -> int:
+    def _pop_expired_channels(self, current_time: datetime) -> List[int]:
+        """
+        Pop games whose deadline has passed from the expiry heap.
+
+        Entries for games that already ended, or that were replaced by a newer
+        game in the same channel, are discarded without being reported.
+
+        Args:
+            current_time: Time to compare deadlines against.
+
+        Returns:
+            Channel IDs of games that have been running longer than allowed.
+        """
+        now = current_time.timestamp()
+        expired = []
+
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            _, channel_id = heapq.heappop(self._expiry_heap)
+            game_session = self.active_games.get(channel_id)
+            if (
+                game_session is not None
+                and current_time - game_session.start_time > _MAX_GAME_DURATION
+            ):
+                expired.append(channel_id)
+
+        return expired
+
+    async def cleanup_expired_games(self, full_scan: bool = True) -> int:
         """
         Clean up expired, abandoned, or inaccessible games with comprehensive checks.
 
+        Args:
+            full_scan: Check every active game for expiry, inaccessible
+                channels, and invalid or missing state. When False, only games
+                whose deadline has passed are popped from the expiry heap.
+
         Returns:
             Number of games cleaned up.
         """
         cleaned_count = 0
         current_time = datetime.now()
-        expired_channels = []
+        expired_channels = [
+            (channel_id, "expired")
+            for channel_id in self._pop_expired_channels(current_time)
+        ]
 
         # Create a copy of active games to avoid modification during iteration
-        active_games_copy = dict(self.active_games)
+        active_games_copy = dict(self.active_games) if full_scan else {}
+        for channel_id, _ in expired_channels:
+            active_games_copy.pop(channel_id, None)
 
         for channel_id, game_session in active_games_copy.items():
             should_cleanup = False
@@ -768,8 +874,7 @@ class GameManager:
 
             try:
                 # Check if game has been running too long
-                max_duration = timedelta(minutes=10)  # Extended from 5 to 10 minutes
-                if current_time - game_session.start_time > max_duration:
+                if current_time - game_session.start_time > _MAX_GAME_DURATION:
                     should_cleanup = True
                     cleanup_reason = "expired"
 
@@ -792,26 +897,28 @@ class GameManager:
                     expired_channels.append((channel_id, cleanup_reason))
 
             except Exception as e:
-                logger.error(f"Error checking game {channel_id} for cleanup: {e}")
+                logger.error("Error checking game %s for cleanup: %s", channel_id, e)
                 expired_channels.append((channel_id, "error"))
 
         # Clean up identified games
         for channel_id, reason in expired_channels:
             try:
                 logger.info(
-                    f"Cleaning up game in channel {channel_id}, reason: {reason}"
+                    "Cleaning up game in channel %s, reason: %s", channel_id, reason
                 )
                 await self.end_game(channel_id, reason=f"cleanup_{reason}")
                 cleaned_count += 1
             except Exception as e:
-                logger.error(f"Error cleaning up game in channel {channel_id}: {e}")
+                logger.error("Error cleaning up game in channel %s: %s", channel_id, e)
                 # Force cleanup if normal cleanup fails
                 try:
                     await self._cleanup_game(channel_id)
                     cleaned_count += 1
                 except Exception as force_error:
                     logger.error(
-                        f"Force cleanup also failed for channel {channel_id}: {force_error}"
+                        "Force cleanup also failed for channel %s: %s",
+                        channel_id,
+                        force_error,
                     )
 
         return cleaned_count
@@ -827,9 +934,9 @@ class GameManager:
             return 0
 
         cleaned_count = 0
-        channels_to_check = set(self.active_games.keys()) | self._inaccessible_channels
 
-        for channel_id in list(channels_to_check):
+        # The union is a new set, so the loop can mutate both sources
+        for channel_id in self.active_games.keys() | self._inaccessible_channels:
             try:
                 # Try to access the channel
                 channel = self.bot.get_channel(channel_id)
@@ -855,7 +962,7 @@ class GameManager:
 
             except Exception as e:
                 logger.error(
-                    f"Error checking accessibility of channel {channel_id}: {e}"
+                    "Error checking accessibility of channel %s: %s", channel_id, e
                 )
                 self._inaccessible_channels.add(channel_id)
                 if channel_id in self.active_games:
@@ -884,7 +991,9 @@ class GameManager:
                         pass
                     except Exception as e:
                         logger.warning(
-                            f"Error cancelling old timer for channel {channel_id}: {e}"
+                            "Error cancelling old timer for channel %s: %s",
+                            channel_id,
+                            e,
                         )
 
             # Create and start new timer task
@@ -894,7 +1003,7 @@ class GameManager:
             self.game_timers[channel_id] = timer_task
 
         except Exception as e:
-            logger.error(f"Error starting timer for channel {channel_id}: {e}")
+            logger.error("Error starting timer for channel %s: %s", channel_id, e)
             # If timer fails to start, set a fallback cleanup
             asyncio.create_task(self._fallback_timer(channel_id, timeout_duration))
 
@@ -903,10 +1012,10 @@ class GameManager:
         try:
             await asyncio.sleep(timeout_duration + 10)  # Extra 10 seconds buffer
             if channel_id in self.active_games:
-                logger.warning(f"Fallback timer triggered for channel {channel_id}")
+                logger.warning("Fallback timer triggered for channel %s", channel_id)
                 await self.end_game(channel_id, reason="fallback_timeout")
         except Exception as e:
-            logger.error(f"Error in fallback timer for channel {channel_id}: {e}")
+            logger.error("Error in fallback timer for channel %s: %s", channel_id, e)
 
     async def _game_timer_task(self, channel_id: int, timeout_duration: int) -> None:
         """
@@ -917,21 +1026,29 @@ class GameManager:
             timeout_duration: Timeout duration in seconds.
         """
         try:
-            countdown_intervals = [20, 10]  # Send countdown at these remaining seconds
             last_check_time = datetime.now()
+            remaining = timeout_duration
 
-            for remaining in range(timeout_duration, 0, -1):
+            while remaining > 0:
                 try:
-                    await asyncio.sleep(1)
+                    # Sleep straight to the next countdown notification or
+                    # validation check instead of waking every second
+                    next_stop = max(
+                        (r for r in _COUNTDOWN_INTERVALS if r < remaining), default=0
+                    )
+                    step = min(remaining - next_stop, _TIMER_CHECK_INTERVAL)
+                    await asyncio.sleep(step)
+                    remaining -= step
 
                     # Periodic validation to ensure game is still valid
                     current_time = datetime.now()
                     if (
                         current_time - last_check_time
-                    ).total_seconds() >= 10:  # Check every 10 seconds
+                    ).total_seconds() >= _TIMER_CHECK_INTERVAL:
                         if not await self._validate_game_state(channel_id):
                             logger.warning(
-                                f"Game state invalid during timer for channel {channel_id}"
+                                "Game state invalid during timer for channel %s",
+                                channel_id,
                             )
                             return
                         last_check_time = current_time
@@ -939,19 +1056,21 @@ class GameManager:
                     # Check if game still exists
                     if channel_id not in self.active_games:
                         logger.debug(
-                            f"Game no longer exists during timer for channel {channel_id}"
+                            "Game no longer exists during timer for channel %s",
+                            channel_id,
                         )
                         return
 
                     # Send countdown notification at specific intervals
-                    if remaining in countdown_intervals:
+                    if remaining in _COUNTDOWN_INTERVALS:
                         callback = self.countdown_callbacks.get(channel_id)
                         if callback:
                             try:
                                 await callback(remaining)
                             except discord.Forbidden:
                                 logger.warning(
-                                    f"Permission error in countdown callback for channel {channel_id}"
+                                    "Permission error in countdown callback for channel %s",
+                                    channel_id,
                                 )
                                 # Mark channel as inaccessible and end game
                                 self._inaccessible_channels.add(channel_id)
@@ -961,7 +1080,8 @@ class GameManager:
                                 return
                             except discord.NotFound:
                                 logger.warning(
-                                    f"Resource not found in countdown callback for channel {channel_id}"
+                                    "Resource not found in countdown callback for channel %s",
+                                    channel_id,
                                 )
                                 # Channel or message was deleted, end game
                                 await self.end_game(
@@ -970,15 +1090,19 @@ class GameManager:
                                 return
                             except Exception as e:
                                 logger.error(
-                                    f"Error in countdown callback for channel {channel_id}: {e}"
+                                    "Error in countdown callback for channel %s: %s",
+                                    channel_id,
+                                    e,
                                 )
                                 # Continue timer despite callback error
 
                 except asyncio.CancelledError:
-                    logger.debug(f"Timer cancelled for channel {channel_id}")
+                    logger.debug("Timer cancelled for channel %s", channel_id)
                     return
                 except Exception as e:
-                    logger.error(f"Error in timer loop for channel {channel_id}: {e}")
+                    logger.error(
+                        "Error in timer loop for channel %s: %s", channel_id, e
+                    )
                     # Continue the timer unless it's a critical error
                     if isinstance(e, (discord.Forbidden, discord.NotFound)):
                         await self.end_game(channel_id, reason="timer_error")
@@ -986,7 +1110,7 @@ class GameManager:
 
             # Game timed out normally
             if channel_id in self.active_games:
-                logger.info(f"Game timed out in channel {channel_id}")
+                logger.info("Game timed out in channel %s", channel_id)
 
                 # Call timeout callback
                 callback = self.timeout_callbacks.get(channel_id)
@@ -995,34 +1119,40 @@ class GameManager:
                         await callback()
                     except discord.Forbidden:
                         logger.warning(
-                            f"Permission error in timeout callback for channel {channel_id}"
+                            "Permission error in timeout callback for channel %s",
+                            channel_id,
                         )
                         self._inaccessible_channels.add(channel_id)
                     except discord.NotFound:
                         logger.warning(
-                            f"Resource not found in timeout callback for channel {channel_id}"
+                            "Resource not found in timeout callback for channel %s",
+                            channel_id,
                         )
                     except Exception as e:
                         logger.error(
-                            f"Error in timeout callback for channel {channel_id}: {e}"
+                            "Error in timeout callback for channel %s: %s",
+                            channel_id,
+                            e,
                         )
 
                 # End the game
                 await self.end_game(channel_id, reason="timeout")
 
         except asyncio.CancelledError:
-            logger.debug(f"Timer cancelled for channel {channel_id}")
+            logger.debug("Timer cancelled for channel %s", channel_id)
         except Exception as e:
             self._record_error("timer_task")
             logger.error(
-                f"Critical error in timer task for channel {channel_id}: {e}",
+                "Critical error in timer task for channel %s: %s",
+                channel_id,
+                e,
                 exc_info=True,
             )
             # Ensure game is cleaned up even if timer fails
             try:
                 await self.end_game(channel_id, reason="timer_error")
             except Exception as cleanup_error:
-                logger.error(f"Error cleaning up after timer failure: {cleanup_error}")
+                logger.error("Error cleaning up after timer failure: %s", cleanup_error)
 
     async def _cleanup_game(self, channel_id: int) -> None:
         """
@@ -1050,18 +1180,11 @@ class GameManager:
                 finally:
                     self.game_timers.pop(channel_id, None)
 
-            # Remove callbacks
-            try:
-                self.timeout_callbacks.pop(channel_id, None)
-                self.countdown_callbacks.pop(channel_id, None)
-            except Exception as e:
-                cleanup_errors.append(f"callback removal: {e}")
-
-            # Remove active game
-            try:
-                self.active_games.pop(channel_id, None)
-            except Exception as e:
-                cleanup_errors.append(f"game removal: {e}")
+            # Remove callbacks and the active game (dict.pop with a default cannot raise)
+            self.timeout_callbacks.pop(channel_id, None)
+            self.countdown_callbacks.pop(channel_id, None)
+            self.active_games.pop(channel_id, None)
+            self._snapshot_ts = None
 
             # Clean up channel lock if no longer needed
             try:
@@ -1076,16 +1199,20 @@ class GameManager:
 
             if cleanup_errors:
                 logger.warning(
-                    f"Cleanup errors for channel {channel_id}: {'; '.join(cleanup_errors)}"
+                    "Cleanup errors for channel %s: %s",
+                    channel_id,
+                    "; ".join(cleanup_errors),
                 )
             else:
                 logger.debug(
-                    f"Successfully cleaned up game resources for channel {channel_id}"
+                    "Successfully cleaned up game resources for channel %s", channel_id
                 )
 
         except Exception as e:
             logger.error(
-                f"Critical error cleaning up game for channel {channel_id}: {e}",
+                "Critical error cleaning up game for channel %s: %s",
+                channel_id,
+                e,
                 exc_info=True,
             )
 
@@ -1105,18 +1232,12 @@ class GameManager:
                 # Clean up inaccessible channels
                 inaccessible_count = await self.cleanup_inaccessible_channels()
 
-                # Reset error count if it's been more than an hour
-                if (
-                    self._last_error_time
-                    and datetime.now() - self._last_error_time > timedelta(hours=1)
-                ):
-                    self._error_count = 0
-
                 # Log maintenance summary
                 if expired_count > 0 or inaccessible_count > 0:
                     logger.info(
-                        f"Maintenance completed: {expired_count} expired games, "
-                        f"{inaccessible_count} inaccessible channels cleaned up"
+                        "Maintenance completed: %s expired games, %s inaccessible channels cleaned up",
+                        expired_count,
+                        inaccessible_count,
                     )
 
                 # Update last channel check time
@@ -1126,7 +1247,7 @@ class GameManager:
                 logger.info("Periodic maintenance task cancelled")
                 break
             except Exception as e:
-                logger.error(f"Error in periodic maintenance: {e}", exc_info=True)
+                logger.error("Error in periodic maintenance: %s", e, exc_info=True)
                 # Continue running despite errors
 
     async def _periodic_cleanup(self) -> None:
@@ -1142,7 +1263,7 @@ class GameManager:
 
                 # Additional cleanup for error recovery
                 if (
-                    self._error_count > self._max_errors_per_hour / 4
+                    self._recent_error_count() > self._max_errors_per_hour / 4
                 ):  # If error rate is high
                     logger.warning(
                         "High error rate detected, performing additional cleanup"
@@ -1151,13 +1272,13 @@ class GameManager:
                     cleaned += inaccessible_cleaned
 
                 if cleaned > 0:
-                    logger.info(f"Periodic cleanup: removed {cleaned} games/channels")
+                    logger.info("Periodic cleanup: removed %s games/channels", cleaned)
 
             except asyncio.CancelledError:
                 logger.info("Periodic cleanup task cancelled")
                 break
             except Exception as e:
-                logger.error(f"Error in periodic cleanup: {e}", exc_info=True)
+                logger.error("Error in periodic cleanup: %s", e, exc_info=True)
                 # Continue running despite errors
 
     async def shutdown(self) -> None:
@@ -1186,7 +1307,7 @@ class GameManager:
 
             # End all active games
             ended_count = await self.force_end_all_games("shutdown")
-            logger.info(f"Ended {ended_count} active games during shutdown")
+            logger.info("Ended %s active games during shutdown", ended_count)
 
             # Cancel all remaining timers
             timer_errors = 0
@@ -1200,7 +1321,7 @@ class GameManager:
                 except Exception as e:
                     timer_errors += 1
                     logger.debug(
-                        f"Error cancelling timer for channel {channel_id}: {e}"
+                        "Error cancelling timer for channel %s: %s", channel_id, e
                     )
 
             if timer_errors > 0:
@@ -1212,6 +1333,7 @@ class GameManager:
                 self.timeout_callbacks.clear()
                 self.countdown_callbacks.clear()
                 self.active_games.clear()
+                self._expiry_heap.clear()
                 self._game_locks.clear()
                 self._inaccessible_channels.clear()
             except Exception as e:
@@ -1219,14 +1341,15 @@ class GameManager:
 
             if shutdown_errors:
                 logger.warning(
-                    f"Game manager shutdown completed with errors: {'; '.join(shutdown_errors)}"
+                    "Game manager shutdown completed with errors: %s",
+                    "; ".join(shutdown_errors),
                 )
             else:
                 logger.info("Game manager shutdown completed successfully")
 
         except Exception as e:
             logger.error(
-                f"Critical error during game manager shutdown: {e}", exc_info=True
+                "Critical error during game manager shutdown: %s", e, exc_info=True
             )
 
     def get_expected_answer_format(self, channel_id: int) -> Optional[str]:
@@ -1280,6 +1403,114 @@ class GameManager:
             game_session.question, emoji_str
         )
 
+    def _compute_snapshot(self) -> Mapping[str, Any]:
+        """
+        Scan active games once for the data shared by stats and health checks.
+
+        Returns:
+            Read-only mapping with duration aggregates, per-difficulty and
+            per-type counts, the number of potentially stuck games, and the
+            number of games that could not be analyzed.
+        """
+        current_time = datetime.now()
+        snapshot = {
+            "games": len(self.active_games),
+            "durations_min": None,
+            "durations_max": None,
+            "durations_sum": 0.0,
+            "count": 0,
+            "by_difficulty": {},
+            "by_type": {"regular": 0, "challenge": 0},
+            "stuck_games": 0,
+            "scan_errors": 0,
+        }
+
+        for game_session in self.active_games.values():
+            try:
+                # Count by difficulty
+                difficulty = getattr(game_session, "difficulty", "unknown") or "unknown"
+                snapshot["by_difficulty"][difficulty] = (
+                    snapshot["by_difficulty"].get(difficulty, 0) + 1
+                )
+
+                # Count by type
+                if getattr(game_session, "is_challenge", False):
+                    snapshot["by_type"]["challenge"] += 1
+                else:
+                    snapshot["by_type"]["regular"] += 1
+
+                # Track game duration
+                if hasattr(game_session, "start_time"):
+                    elapsed = current_time - game_session.start_time
+                    duration = elapsed.total_seconds()
+                    if snapshot["count"] == 0:
+                        snapshot["durations_min"] = duration
+                        snapshot["durations_max"] = duration
+                    else:
+                        snapshot["durations_min"] = min(
+                            snapshot["durations_min"], duration
+                        )
+                        snapshot["durations_max"] = max(
+                            snapshot["durations_max"], duration
+                        )
+                    snapshot["durations_sum"] += duration
+                    snapshot["count"] += 1
+
+                    if elapsed > _STUCK_GAME_DURATION:
+                        snapshot["stuck_games"] += 1
+
+            except Exception as e:
+                snapshot["scan_errors"] += 1
+                logger.debug("Error analyzing game session: %s", e)
+
+        snapshot["by_difficulty"] = MappingProxyType(snapshot["by_difficulty"])
+        snapshot["by_type"] = MappingProxyType(snapshot["by_type"])
+        return MappingProxyType(snapshot)
+
+    def _maybe_cached_snapshot(self) -> Mapping[str, Any]:
+        """
+        Get the active-game snapshot, re-using it for up to one second.
+
+        The cache is invalidated whenever a game starts or is cleaned up, and
+        when the number of active games no longer matches the cached scan.
+
+        Returns:
+            Read-only snapshot as produced by _compute_snapshot.
+        """
+        now = time.monotonic()
+        if (
+            self._snapshot_ts is not None
+            and now - self._snapshot_ts < _SNAPSHOT_TTL_SECONDS
+            and self._snapshot.get("games") == len(self.active_games)
+        ):
+            return self._snapshot
+
+        self._snapshot = self._compute_snapshot()
+        self._snapshot_ts = now
+        return self._snapshot
+
+    def _iso_cached(self, name: str, value: Optional[datetime]) -> Optional[str]:
+        """
+        Format a timestamp as ISO 8601, re-using the last result for the same object.
+
+        Args:
+            name: Cache slot for the timestamp (e.g. "last_error_time").
+            value: Timestamp to format, or None.
+
+        Returns:
+            ISO formatted string, or None if value is None.
+        """
+        if value is None:
+            return None
+
+        cached = self._iso_cache.get(name)
+        if cached is not None and cached[0] is value:
+            return cached[1]
+
+        iso_value = value.isoformat()
+        self._iso_cache[name] = (value, iso_value)
+        return iso_value
+
     def get_game_stats(self) -> Dict[str, Any]:
         """
         Get comprehensive statistics about active games and system health.
@@ -1288,23 +1519,26 @@ class GameManager:
             Dictionary containing game statistics and health information.
         """
         try:
+            # Analyze active games
+            snapshot = self._maybe_cached_snapshot()
+
             stats = {
                 "active_games": len(self.active_games),
                 "active_timers": len(self.game_timers),
-                "games_by_difficulty": {},
-                "games_by_type": {"regular": 0, "challenge": 0},
+                "games_by_difficulty": dict(snapshot["by_difficulty"]),
+                "games_by_type": dict(snapshot["by_type"]),
                 "error_tracking": {
-                    "error_count": self._error_count,
-                    "last_error_time": self._last_error_time.isoformat()
-                    if self._last_error_time
-                    else None,
+                    "error_count": self._recent_error_count(),
+                    "last_error_time": self._iso_cached(
+                        "last_error_time", self._last_error_time
+                    ),
                     "max_errors_per_hour": self._max_errors_per_hour,
                 },
                 "channel_health": {
                     "inaccessible_channels": len(self._inaccessible_channels),
-                    "last_channel_check": self._last_channel_check.isoformat()
-                    if self._last_channel_check
-                    else None,
+                    "last_channel_check": self._iso_cached(
+                        "last_channel_check", self._last_channel_check
+                    ),
                 },
                 "background_tasks": {
                     "cleanup_task_running": self._cleanup_task
@@ -1314,46 +1548,18 @@ class GameManager:
                 },
             }
 
-            # Analyze active games
-            game_durations = []
-            for game_session in self.active_games.values():
-                try:
-                    # Count by difficulty
-                    difficulty = (
-                        getattr(game_session, "difficulty", "unknown") or "unknown"
-                    )
-                    stats["games_by_difficulty"][difficulty] = (
-                        stats["games_by_difficulty"].get(difficulty, 0) + 1
-                    )
-
-                    # Count by type
-                    if getattr(game_session, "is_challenge", False):
-                        stats["games_by_type"]["challenge"] += 1
-                    else:
-                        stats["games_by_type"]["regular"] += 1
-
-                    # Track game duration
-                    if hasattr(game_session, "start_time"):
-                        duration = (
-                            datetime.now() - game_session.start_time
-                        ).total_seconds()
-                        game_durations.append(duration)
-
-                except Exception as e:
-                    logger.debug(f"Error analyzing game session: {e}")
-
             # Add duration statistics
-            if game_durations:
+            if snapshot["count"]:
                 stats["game_durations"] = {
-                    "average_seconds": sum(game_durations) / len(game_durations),
-                    "max_seconds": max(game_durations),
-                    "min_seconds": min(game_durations),
+                    "average_seconds": snapshot["durations_sum"] / snapshot["count"],
+                    "max_seconds": snapshot["durations_max"],
+                    "min_seconds": snapshot["durations_min"],
                 }
 
             return stats
 
         except Exception as e:
-            logger.error(f"Error generating game stats: {e}")
+            logger.error("Error generating game stats: %s", e)
             return {
                 "error": str(e),
                 "active_games": len(self.active_games)
@@ -1372,8 +1578,9 @@ class GameManager:
             health = {"status": "unknown", "issues": [], "recommendations": []}
 
             # Check error rate
-            if self._error_count > self._max_errors_per_hour:
-                health["issues"].append(f"High error rate: {self._error_count} errors")
+            error_count = self._recent_error_count()
+            if error_count > self._max_errors_per_hour:
+                health["issues"].append(f"High error rate: {error_count} errors")
                 health["recommendations"].append("Check logs and restart if necessary")
 
             # Check inaccessible channels
@@ -1395,20 +1602,22 @@ class GameManager:
                 health["recommendations"].append("Restart background tasks")
 
             # Check for stuck games
-            stuck_games = 0
-            current_time = datetime.now()
-            for game_session in self.active_games.values():
-                if hasattr(game_session, "start_time"):
-                    duration = current_time - game_session.start_time
-                    if duration > timedelta(
-                        minutes=15
-                    ):  # Games running longer than 15 minutes
-                        stuck_games += 1
+            snapshot = self._maybe_cached_snapshot()
+            stuck_games = snapshot["stuck_games"]
 
             if stuck_games > 0:
                 health["issues"].append(f"{stuck_games} potentially stuck games")
                 health["recommendations"].append("Run cleanup to remove stuck games")
 
+            # Games whose state could not be read are not counted as stuck above
+            if snapshot["scan_errors"] > 0:
+                health["issues"].append(
+                    f"{snapshot['scan_errors']} games could not be checked"
+                )
+                health["recommendations"].append(
+                    "Run cleanup to remove games with invalid state"
+                )
+
             # Determine overall status
             if not health["issues"]:
                 health["status"] = "healthy"
@@ -1420,7 +1629,7 @@ class GameManager:
             return health
 
         except Exception as e:
-            logger.error(f"Error getting health status: {e}")
+            logger.error("Error getting health status: %s", e)
             return {
                 "status": "error",
                 "issues": [f"Health check failed: {e}"],
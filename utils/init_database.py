@@ -30,14 +30,14 @@ async def initialize_database():
         # Initialize the database
         await db_manager.initialize_database()
 
-        # Check database integrity
-        integrity_ok = await db_manager.check_database_integrity()
+        # Check database integrity and gather stats concurrently
+        integrity_ok, stats = await asyncio.gather(
+            db_manager.check_database_integrity(), db_manager.get_database_stats()
+        )
         if not integrity_ok:
             logger.error("Database integrity check failed after initialization")
             return False
 
-        # Get database stats
-        stats = await db_manager.get_database_stats()
         logger.info(f"Database initialized successfully. Stats: {stats}")
 
         # Create initial backup
@@ -87,14 +87,28 @@ async def test_database_operations():
         logger.info("Testing database operations...")
 
         async with db_manager.get_connection() as conn:
-            # Test inserting a user
-            await conn.execute(
-                """
-                INSERT OR REPLACE INTO users (user_id, total_points, questions_answered)
-                VALUES (?, ?, ?)
-            """,
-                (12345, 100, 10),
-            )
+            # Write both test rows in a single transaction
+            await conn.execute("BEGIN IMMEDIATE")
+            try:
+                await conn.execute(
+                    """
+                    INSERT OR REPLACE INTO users (user_id, total_points, questions_answered)
+                    VALUES (?, ?, ?)
+                """,
+                    (12345, 100, 10),
+                )
+                await conn.execute(
+                    """
+                    INSERT INTO questions (question_text, question_type, difficulty, category, correct_answer, point_value)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                    ("Test question?", "multiple_choice", "easy", "test", "A", 10),
+                )
+                await conn.commit()
+            except Exception:
+                # Don't hand the connection back to the pool mid-transaction
+                await conn.rollback()
+                raise
 
             # Test querying the user
             cursor = await conn.execute(
@@ -102,34 +116,24 @@ async def test_database_operations():
             )
             user = await cursor.fetchone()
 
-            if user:
-                logger.info(f"Test user created successfully: {user}")
-            else:
-                logger.error("Failed to create test user")
-                return False
-
-            # Test inserting a question
-            await conn.execute(
-                """
-                INSERT INTO questions (question_text, question_type, difficulty, category, correct_answer, point_value)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """,
-                ("Test question?", "multiple_choice", "easy", "test", "A", 10),
-            )
-
             # Test querying the question
             cursor = await conn.execute(
                 "SELECT * FROM questions WHERE category = ?", ("test",)
             )
             question = await cursor.fetchone()
 
+            if user:
+                logger.info(f"Test user created successfully: {user}")
+            else:
+                logger.error("Failed to create test user")
+                return False
+
             if question:
                 logger.info(f"Test question created successfully: {question}")
             else:
                 logger.error("Failed to create test question")
                 return False
 
-            await conn.commit()
             logger.info("All database operations test passed!")
             return True
 
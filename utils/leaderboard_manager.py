@@ -4,24 +4,96 @@ Handles leaderboard calculation, caching, and ranking operations with weekly/mon
 """
 
 import logging
-from datetime import datetime, date, timedelta
+from datetime import date, timedelta
 from typing import Optional, List, Dict, Any, Tuple
 from utils.database import db_manager
 from utils.models import LeaderboardEntry, UserProfile
 import aiosqlite
 import asyncio
+import time
 
 logger = logging.getLogger(__name__)
 
+# Fixed leaderboard page queries, kept as constants so every call sends the
+# identical SQL text and hits the connection's prepared-statement cache
+_SQL_ALL_TIME = """
+    WITH ranked AS (
+        SELECT 
+            ROW_NUMBER() OVER (ORDER BY total_points DESC) as rank,
+            user_id,
+            total_points,
+            questions_answered,
+            questions_correct,
+            current_streak,
+            CASE 
+                WHEN questions_answered > 0 
+                THEN ROUND((questions_correct * 100.0) / questions_answered, 1)
+                ELSE 0.0
+            END as accuracy_percentage
+        FROM users
+        WHERE total_points > 0
+    )
+    SELECT * FROM (SELECT * FROM ranked ORDER BY rank LIMIT ? OFFSET ?)
+    UNION ALL
+    SELECT * FROM ranked WHERE user_id = ? AND (rank <= ? OR rank > ?)
+"""
+
+_SQL_WEEKLY = """
+    SELECT 
+        rank,
+        user_id,
+        points,
+        questions_answered,
+        questions_correct,
+        current_streak,
+        CASE 
+            WHEN questions_answered > 0 
+            THEN ROUND((questions_correct * 100.0) / questions_answered, 1)
+            ELSE 0.0
+        END as accuracy_percentage
+    FROM weekly_rankings
+    WHERE week_start = ? AND points > 0
+    ORDER BY rank
+    LIMIT ? OFFSET ?
+"""
+
+_SQL_MONTHLY = """
+    SELECT 
+        ROW_NUMBER() OVER (ORDER BY p.points DESC) as rank,
+        u.user_id,
+        p.points,
+        u.questions_answered,
+        u.questions_correct,
+        u.current_streak,
+        CASE 
+            WHEN u.questions_answered > 0 
+            THEN ROUND((u.questions_correct * 100.0) / u.questions_answered, 1)
+            ELSE 0.0
+        END as accuracy_percentage
+    FROM user_period_points p
+    JOIN users u ON p.user_id = u.user_id
+    WHERE p.period_type = 'month' AND p.period_start = ? AND p.points > 0
+    ORDER BY p.points DESC
+    LIMIT ? OFFSET ?
+"""
+
 
 class LeaderboardManager:
     """Manages leaderboard calculations, caching, and ranking operations."""
 
     def __init__(self):
         self.db_manager = db_manager
-        self._cache = {}
-        self._cache_expiry = {}
-        self.cache_duration = 300  # 5 minutes in seconds
+        # (period, limit, offset) -> (entries, time.monotonic() expiry)
+        self._cache: Dict[
+            Tuple[str, int, int], Tuple[List[LeaderboardEntry], float]
+        ] = {}
+        # Pages are dropped by invalidate() when points change; the TTL is
+        # only a backstop for writes that bypass the hook.
+        self.cache_duration = 3600  # 1 hour in seconds
+        self._weekly_refresh_at: Dict[date, float] = {}
+        self.weekly_refresh_interval = 60  # seconds between ranking recomputes
+        # (day computed on, week start) so the Monday lookup runs once a day
+        self._week_start_cache: Tuple[Optional[date], Optional[date]] = (None, None)
 
     async def get_leaderboard(
         self,
@@ -40,18 +112,23 @@ class LeaderboardManager:
             user_context: If provided, include user's position even if not in top results
         """
         try:
-            cache_key = f"leaderboard_{period}_{limit}_{offset}"
-
-            # Check cache first
-            if self._is_cache_valid(cache_key):
-                cached_result = self._cache.get(cache_key)
-                if cached_result:
-                    logger.debug(f"Returning cached leaderboard for {period}")
-                    return cached_result
+            cache_key = (period, limit, offset)
+
+            # Check cache first; a cached page without the context user's row
+            # is refreshed below so their position can be included
+            cached_result = self._get_cached(cache_key)
+            if cached_result and (
+                not user_context
+                or any(entry.user_id == user_context for entry in cached_result)
+            ):
+                logger.debug(f"Returning cached leaderboard for {period}")
+                return cached_result
 
             async with self.db_manager.get_connection() as conn:
                 if period == "all_time":
-                    entries = await self._get_all_time_leaderboard(conn, limit, offset)
+                    entries = await self._get_all_time_leaderboard(
+                        conn, limit, offset, user_context
+                    )
                 elif period == "weekly":
                     entries = await self._get_weekly_leaderboard(conn, limit, offset)
                 elif period == "monthly":
@@ -59,15 +136,22 @@ class LeaderboardManager:
                 else:
                     raise ValueError(f"Invalid period: {period}")
 
-                # Cache the result
-                self._cache[cache_key] = entries
-                self._cache_expiry[cache_key] = datetime.now() + timedelta(
-                    seconds=self.cache_duration
+                # Cache the requested page only, never the context user's row
+                self._cache[cache_key] = (
+                    [
+                        entry
+                        for entry in entries
+                        if offset < entry.rank <= offset + limit
+                    ],
+                    time.monotonic() + self.cache_duration,
                 )
 
                 # If user_context provided and user not in results, add their position
-                if user_context and not any(
-                    entry.user_id == user_context for entry in entries
+                # (the all-time query already includes it)
+                if (
+                    user_context
+                    and period != "all_time"
+                    and not any(entry.user_id == user_context for entry in entries)
                 ):
                     user_entry = await self._get_user_position(
                         conn, user_context, period
@@ -82,32 +166,34 @@ class LeaderboardManager:
             raise
 
     async def _get_all_time_leaderboard(
-        self, conn: aiosqlite.Connection, limit: int, offset: int
+        self,
+        conn: aiosqlite.Connection,
+        limit: int,
+        offset: int,
+        user_context: Optional[int] = None,
     ) -> List[LeaderboardEntry]:
-        """Get all-time leaderboard based on total points."""
+        """
+        Get all-time leaderboard based on total points.
+
+        If user_context is ranked outside the requested page, their entry is
+        appended by the same query.
+        """
         cursor = await conn.execute(
-            """
-            SELECT 
-                ROW_NUMBER() OVER (ORDER BY total_points DESC) as rank,
-                user_id,
-                total_points,
-                questions_answered,
-                questions_correct,
-                current_streak,
-                CASE 
-                    WHEN questions_answered > 0 
-                    THEN ROUND((questions_correct * 100.0) / questions_answered, 1)
-                    ELSE 0.0
-                END as accuracy_percentage
-            FROM users
-            WHERE total_points > 0
-            ORDER BY total_points DESC
-            LIMIT ? OFFSET ?
-            """,
-            (limit, offset),
+            _SQL_ALL_TIME,
+            (limit, offset, user_context, offset, offset + limit),
         )
 
-        rows = await cursor.fetchall()
+        return await self._entries_from_cursor(cursor)
+
+    @staticmethod
+    async def _entries_from_cursor(cursor: aiosqlite.Cursor) -> List[LeaderboardEntry]:
+        """
+        Build leaderboard entries from a page query.
+
+        The cursor must yield (rank, user_id, points, questions_answered,
+        questions_correct, current_streak, accuracy_percentage) rows.
+        """
+        # One fetchall round-trip; async iteration would add a trailing fetch
         return [
             LeaderboardEntry(
                 rank=row[0],
@@ -118,7 +204,7 @@ class LeaderboardManager:
                 questions_answered=row[3],
                 current_streak=row[5],
             )
-            for row in rows
+            for row in await cursor.fetchall()
         ]
 
     async def _get_weekly_leaderboard(
@@ -128,44 +214,14 @@ class LeaderboardManager:
         week_start = self._get_week_start()
 
         # First, ensure weekly rankings are up to date
-        await self._update_weekly_rankings(conn, week_start)
+        await self._refresh_weekly_rankings(conn, week_start)
 
         cursor = await conn.execute(
-            """
-            SELECT 
-                wr.rank,
-                wr.user_id,
-                wr.points,
-                u.questions_answered,
-                u.questions_correct,
-                u.current_streak,
-                CASE 
-                    WHEN u.questions_answered > 0 
-                    THEN ROUND((u.questions_correct * 100.0) / u.questions_answered, 1)
-                    ELSE 0.0
-                END as accuracy_percentage
-            FROM weekly_rankings wr
-            JOIN users u ON wr.user_id = u.user_id
-            WHERE wr.week_start = ? AND wr.points > 0
-            ORDER BY wr.rank
-            LIMIT ? OFFSET ?
-            """,
+            _SQL_WEEKLY,
             (week_start, limit, offset),
         )
 
-        rows = await cursor.fetchall()
-        return [
-            LeaderboardEntry(
-                rank=row[0],
-                user_id=row[1],
-                username=f"User#{row[1]}",
-                total_points=row[2],
-                accuracy_percentage=row[6],
-                questions_answered=row[3],
-                current_streak=row[5],
-            )
-            for row in rows
-        ]
+        return await self._entries_from_cursor(cursor)
 
     async def _get_monthly_leaderboard(
         self, conn: aiosqlite.Connection, limit: int, offset: int
@@ -174,61 +230,11 @@ class LeaderboardManager:
         month_start = date.today().replace(day=1)
 
         cursor = await conn.execute(
-            """
-            SELECT 
-                ROW_NUMBER() OVER (ORDER BY monthly_points DESC) as rank,
-                user_id,
-                monthly_points,
-                questions_answered,
-                questions_correct,
-                current_streak,
-                accuracy_percentage
-            FROM (
-                SELECT 
-                    u.user_id,
-                    u.questions_answered,
-                    u.questions_correct,
-                    u.current_streak,
-                    CASE 
-                        WHEN u.questions_answered > 0 
-                        THEN ROUND((u.questions_correct * 100.0) / u.questions_answered, 1)
-                        ELSE 0.0
-                    END as accuracy_percentage,
-                    COALESCE(SUM(
-                        CASE q.difficulty
-                            WHEN 'easy' THEN 10
-                            WHEN 'medium' THEN 20
-                            WHEN 'hard' THEN 30
-                            ELSE 0
-                        END
-                    ), 0) as monthly_points
-                FROM users u
-                LEFT JOIN game_sessions gs ON u.user_id = gs.user_id 
-                    AND gs.is_completed = 1 
-                    AND DATE(gs.end_time) >= ?
-                LEFT JOIN questions q ON gs.question_id = q.id
-                GROUP BY u.user_id, u.questions_answered, u.questions_correct, u.current_streak
-            ) monthly_stats
-            WHERE monthly_points > 0
-            ORDER BY monthly_points DESC
-            LIMIT ? OFFSET ?
-            """,
+            _SQL_MONTHLY,
             (month_start, limit, offset),
         )
 
-        rows = await cursor.fetchall()
-        return [
-            LeaderboardEntry(
-                rank=row[0],
-                user_id=row[1],
-                username=f"User#{row[1]}",
-                total_points=row[2],
-                accuracy_percentage=row[6],
-                questions_answered=row[3],
-                current_streak=row[5],
-            )
-            for row in rows
-        ]
+        return await self._entries_from_cursor(cursor)
 
     async def get_user_rank(
         self, user_id: int, period: str = "all_time"
@@ -258,12 +264,12 @@ class LeaderboardManager:
         self, conn: aiosqlite.Connection, user_id: int
     ) -> Optional[Tuple[int, int]]:
         """Get user's all-time rank."""
-        # Get user's rank
         cursor = await conn.execute(
             """
-            SELECT rank FROM (
+            SELECT rank, total_participants FROM (
                 SELECT user_id, 
-                       ROW_NUMBER() OVER (ORDER BY total_points DESC) as rank
+                       ROW_NUMBER() OVER (ORDER BY total_points DESC) as rank,
+                       COUNT(*) OVER () as total_participants
                 FROM users
                 WHERE total_points > 0
             ) ranked_users
@@ -272,43 +278,32 @@ class LeaderboardManager:
             (user_id,),
         )
 
-        rank_result = await cursor.fetchone()
-        if not rank_result:
-            return None
-
-        # Get total participants
-        cursor = await conn.execute("SELECT COUNT(*) FROM users WHERE total_points > 0")
-        total_result = await cursor.fetchone()
-
-        return (rank_result[0], total_result[0])
+        result = await cursor.fetchone()
+        return (result[0], result[1]) if result else None
 
     async def _get_user_weekly_rank(
         self, conn: aiosqlite.Connection, user_id: int
     ) -> Optional[Tuple[int, int]]:
         """Get user's weekly rank."""
         week_start = self._get_week_start()
-        await self._update_weekly_rankings(conn, week_start)
+        await self._refresh_weekly_rankings(conn, week_start)
 
         cursor = await conn.execute(
             """
-            SELECT rank FROM weekly_rankings 
-            WHERE user_id = ? AND week_start = ?
+            SELECT rank, total_participants FROM (
+                SELECT user_id,
+                       rank,
+                       COUNT(*) OVER (PARTITION BY week_start) as total_participants
+                FROM weekly_rankings
+                WHERE week_start = ? AND points > 0
+            ) ranked_weekly
+            WHERE user_id = ?
             """,
-            (user_id, week_start),
-        )
-
-        rank_result = await cursor.fetchone()
-        if not rank_result:
-            return None
-
-        # Get total weekly participants
-        cursor = await conn.execute(
-            "SELECT COUNT(*) FROM weekly_rankings WHERE week_start = ? AND points > 0",
-            (week_start,),
+            (week_start, user_id),
         )
-        total_result = await cursor.fetchone()
 
-        return (rank_result[0], total_result[0])
+        result = await cursor.fetchone()
+        return (result[0], result[1]) if result else None
 
     async def _get_user_monthly_rank(
         self, conn: aiosqlite.Connection, user_id: int
@@ -321,27 +316,10 @@ class LeaderboardManager:
             SELECT rank, total_participants FROM (
                 SELECT 
                     user_id,
-                    ROW_NUMBER() OVER (ORDER BY monthly_points DESC) as rank,
+                    ROW_NUMBER() OVER (ORDER BY points DESC) as rank,
                     COUNT(*) OVER () as total_participants
-                FROM (
-                    SELECT 
-                        u.user_id,
-                        COALESCE(SUM(
-                            CASE q.difficulty
-                                WHEN 'easy' THEN 10
-                                WHEN 'medium' THEN 20
-                                WHEN 'hard' THEN 30
-                                ELSE 0
-                            END
-                        ), 0) as monthly_points
-                    FROM users u
-                    LEFT JOIN game_sessions gs ON u.user_id = gs.user_id 
-                        AND gs.is_completed = 1 
-                        AND DATE(gs.end_time) >= ?
-                    LEFT JOIN questions q ON gs.question_id = q.id
-                    GROUP BY u.user_id
-                ) monthly_stats
-                WHERE monthly_points > 0
+                FROM user_period_points
+                WHERE period_type = 'month' AND period_start = ? AND points > 0
             ) ranked_monthly
             WHERE user_id = ?
             """,
@@ -351,39 +329,78 @@ class LeaderboardManager:
         result = await cursor.fetchone()
         return (result[0], result[1]) if result else None
 
+    async def _period_ranking_sql(
+        self, conn: aiosqlite.Connection, period: str
+    ) -> Tuple[str, tuple]:
+        """
+        Build the ranking subquery for a period.
+
+        Returns:
+            Tuple of (SQL yielding user_id, rank and points, its parameters)
+        """
+        if period == "all_time":
+            return (
+                """
+                SELECT user_id, total_points as points,
+                       ROW_NUMBER() OVER (ORDER BY total_points DESC) as rank
+                FROM users
+                WHERE total_points > 0
+                """,
+                (),
+            )
+        if period == "weekly":
+            week_start = self._get_week_start()
+            await self._refresh_weekly_rankings(conn, week_start)
+            return (
+                """
+                SELECT user_id, points, rank FROM weekly_rankings
+                WHERE week_start = ? AND points > 0
+                """,
+                (week_start,),
+            )
+        if period == "monthly":
+            return (
+                """
+                SELECT user_id, points,
+                       ROW_NUMBER() OVER (ORDER BY points DESC) as rank
+                FROM user_period_points
+                WHERE period_type = 'month' AND period_start = ? AND points > 0
+                """,
+                (date.today().replace(day=1),),
+            )
+        raise ValueError(f"Invalid period: {period}")
+
     async def _get_user_position(
         self, conn: aiosqlite.Connection, user_id: int, period: str
     ) -> Optional[LeaderboardEntry]:
         """Get user's position entry for leaderboard context."""
-        rank_info = await self.get_user_rank(user_id, period)
-        if not rank_info:
-            return None
+        ranked_sql, params = await self._period_ranking_sql(conn, period)
 
-        rank, _ = rank_info
-
-        # Get user details
         cursor = await conn.execute(
-            """
-            SELECT total_points, questions_answered, questions_correct, current_streak
-            FROM users WHERE user_id = ?
+            f"""
+            SELECT ranked.rank, u.total_points, u.questions_answered,
+                   u.questions_correct, u.current_streak
+            FROM ({ranked_sql}) ranked
+            JOIN users u ON ranked.user_id = u.user_id
+            WHERE ranked.user_id = ?
             """,
-            (user_id,),
+            (*params, user_id),
         )
 
         user_data = await cursor.fetchone()
         if not user_data:
             return None
 
-        accuracy = (user_data[2] / user_data[1] * 100) if user_data[1] > 0 else 0.0
+        accuracy = (user_data[3] / user_data[2] * 100) if user_data[2] > 0 else 0.0
 
         return LeaderboardEntry(
-            rank=rank,
+            rank=user_data[0],
             user_id=user_id,
             username=f"User#{user_id}",
-            total_points=user_data[0],
+            total_points=user_data[1],
             accuracy_percentage=accuracy,
-            questions_answered=user_data[1],
-            current_streak=user_data[3],
+            questions_answered=user_data[2],
+            current_streak=user_data[4],
         )
 
     async def update_weekly_rankings(self) -> None:
@@ -398,52 +415,46 @@ class LeaderboardManager:
             logger.error(f"Error updating weekly rankings: {e}")
             raise
 
+    async def _refresh_weekly_rankings(
+        self, conn: aiosqlite.Connection, week_start: date
+    ) -> None:
+        """Recompute weekly rankings for reads unless they were refreshed recently."""
+        refreshed_at = self._weekly_refresh_at.get(week_start)
+        if (
+            refreshed_at is not None
+            and time.monotonic() - refreshed_at < self.weekly_refresh_interval
+        ):
+            return
+
+        await self._update_weekly_rankings(conn, week_start)
+
     async def _update_weekly_rankings(
         self, conn: aiosqlite.Connection, week_start: date
     ) -> None:
         """Update weekly rankings table for specified week."""
-        # Calculate weekly points for all users
-        cursor = await conn.execute(
+        # Rank the week's rollup rows and write them in a single statement
+        await conn.execute(
             """
-            SELECT 
-                u.user_id,
-                COALESCE(SUM(
-                    CASE q.difficulty
-                        WHEN 'easy' THEN 10
-                        WHEN 'medium' THEN 20
-                        WHEN 'hard' THEN 30
-                        ELSE 0
-                    END
-                ), 0) as weekly_points
-            FROM users u
-            LEFT JOIN game_sessions gs ON u.user_id = gs.user_id 
-                AND gs.is_completed = 1 
-                AND DATE(gs.end_time) >= ? 
-                AND DATE(gs.end_time) < ?
-            LEFT JOIN questions q ON gs.question_id = q.id
-            GROUP BY u.user_id
+            INSERT OR REPLACE INTO weekly_rankings
+            (user_id, week_start, points, rank,
+             questions_answered, questions_correct, current_streak)
+            SELECT
+                p.user_id,
+                p.period_start,
+                p.points,
+                ROW_NUMBER() OVER (ORDER BY p.points DESC) as rank,
+                u.questions_answered,
+                u.questions_correct,
+                u.current_streak
+            FROM user_period_points p
+            JOIN users u ON p.user_id = u.user_id
+            WHERE p.period_type = 'week' AND p.period_start = ? AND p.points > 0
             """,
-            (week_start, week_start + timedelta(days=7)),
+            (week_start,),
         )
 
-        weekly_data = await cursor.fetchall()
-
-        # Sort by points and assign ranks
-        sorted_data = sorted(weekly_data, key=lambda x: x[1], reverse=True)
-
-        # Update or insert weekly rankings
-        for rank, (user_id, points) in enumerate(sorted_data, 1):
-            if points > 0:  # Only include users with points
-                await conn.execute(
-                    """
-                    INSERT OR REPLACE INTO weekly_rankings 
-                    (user_id, week_start, points, rank)
-                    VALUES (?, ?, ?, ?)
-                    """,
-                    (user_id, week_start, points, rank),
-                )
-
         await conn.commit()
+        self._weekly_refresh_at[week_start] = time.monotonic()
 
     async def reset_weekly_rankings(self) -> None:
         """Reset weekly rankings (called at start of new week)."""
@@ -466,19 +477,41 @@ class LeaderboardManager:
     def _get_week_start(self) -> date:
         """Get the start date of current week (Monday)."""
         today = date.today()
-        days_since_monday = today.weekday()
-        return today - timedelta(days=days_since_monday)
+        cached_day, week_start = self._week_start_cache
+        if cached_day != today:
+            week_start = today - timedelta(days=today.weekday())
+            self._week_start_cache = (today, week_start)
+        return week_start
+
+    def _get_cached(
+        self, cache_key: Tuple[str, int, int]
+    ) -> Optional[List[LeaderboardEntry]]:
+        """Return the cached entries for a key if they have not expired."""
+        cached = self._cache.get(cache_key)
+        if cached is None or time.monotonic() >= cached[1]:
+            return None
+        return cached[0]
 
-    def _is_cache_valid(self, cache_key: str) -> bool:
-        """Check if cache entry is still valid."""
-        if cache_key not in self._cache_expiry:
-            return False
-        return datetime.now() < self._cache_expiry[cache_key]
+    def invalidate(self, period: Optional[str] = None) -> None:
+        """
+        Drop cached leaderboard pages after user points change.
+
+        Args:
+            period: "all_time", "weekly", or "monthly"; None drops every period
+        """
+        if period in (None, "weekly"):
+            self._weekly_refresh_at.clear()
+        if period is None:
+            self._clear_cache()
+            return
+
+        for cache_key in [key for key in self._cache if key[0] == period]:
+            del self._cache[cache_key]
+        logger.debug(f"Leaderboard cache invalidated for {period}")
 
     def _clear_cache(self) -> None:
         """Clear all cached leaderboard data."""
         self._cache.clear()
-        self._cache_expiry.clear()
         logger.debug("Leaderboard cache cleared")
 
     async def get_nearby_ranks(
@@ -493,21 +526,32 @@ class LeaderboardManager:
             context_size: Number of users above and below to include
         """
         try:
-            rank_info = await self.get_user_rank(user_id, period)
-            if not rank_info:
-                return []
-
-            user_rank, total_participants = rank_info
-
-            # Calculate range
-            start_rank = max(1, user_rank - context_size)
-            end_rank = min(total_participants, user_rank + context_size)
-
-            # Get entries in range
-            offset = start_rank - 1
-            limit = end_rank - start_rank + 1
-
-            return await self.get_leaderboard(period, limit, offset)
+            async with self.db_manager.get_connection() as conn:
+                ranked_sql, params = await self._period_ranking_sql(conn, period)
+                cursor = await conn.execute(
+                    f"""
+                    WITH ranked AS ({ranked_sql}),
+                    target AS (SELECT rank FROM ranked WHERE user_id = ?)
+                    SELECT 
+                        r.rank,
+                        r.user_id,
+                        r.points,
+                        u.questions_answered,
+                        u.questions_correct,
+                        u.current_streak,
+                        CASE 
+                            WHEN u.questions_answered > 0 
+                            THEN ROUND((u.questions_correct * 100.0) / u.questions_answered, 1)
+                            ELSE 0.0
+                        END as accuracy_percentage
+                    FROM ranked r
+                    JOIN target t ON r.rank BETWEEN t.rank - ? AND t.rank + ?
+                    JOIN users u ON r.user_id = u.user_id
+                    ORDER BY r.rank
+                    """,
+                    (*params, user_id, context_size, context_size),
+                )
+                return await self._entries_from_cursor(cursor)
 
         except Exception as e:
             logger.error(f"Error getting nearby ranks for user {user_id}: {e}")
@@ -4,10 +4,12 @@ Handles schema updates and data migrations between versions.
 """
 
 import logging
-from typing import Dict, List, Callable
+from typing import Dict, List, Callable, Optional, Set
 from datetime import datetime
 import aiosqlite
 
+from utils.database import LEADERBOARD_INDEXES, SESSION_POINTS_SQL
+
 logger = logging.getLogger(__name__)
 
 
@@ -17,30 +19,50 @@ class MigrationManager:
     def __init__(self, db_manager):
         self.db_manager = db_manager
         self.migrations: Dict[int, Callable] = {
-            # Future migrations will be added here
-            # Example: 2: self._migrate_to_v2,
+            2: self._migrate_to_v2,
+            3: self._migrate_to_v3,
+            4: self._migrate_to_v4,
+            5: self._migrate_to_v5,
+            6: self._migrate_to_v6,
+            7: self._migrate_to_v7,
         }
 
     async def run_migrations(
         self, conn: aiosqlite.Connection, from_version: int, to_version: int
     ):
-        """Run all migrations from from_version to to_version."""
+        """
+        Run all migrations from from_version to to_version.
+
+        The whole chain runs in one exclusive transaction, so a failure rolls
+        the database back to from_version instead of leaving it half upgraded.
+        """
         logger.info(f"Running migrations from version {from_version} to {to_version}")
 
-        for version in range(from_version + 1, to_version + 1):
-            if version in self.migrations:
-                logger.info(f"Applying migration to version {version}")
-                await self.migrations[version](conn)
-                await self._update_schema_version(conn, version)
-            else:
-                logger.warning(f"No migration found for version {version}")
+        if conn.in_transaction:
+            await conn.commit()
+        await conn.execute("BEGIN EXCLUSIVE")
+        try:
+            for version in range(from_version + 1, to_version + 1):
+                if version in self.migrations:
+                    logger.info(f"Applying migration to version {version}")
+                    await self.migrations[version](conn)
+                    await self._update_schema_version(conn, version, commit=False)
+                else:
+                    logger.warning(f"No migration found for version {version}")
+            await conn.commit()
+        except Exception:
+            await conn.rollback()
+            raise
 
-    async def _update_schema_version(self, conn: aiosqlite.Connection, version: int):
+    async def _update_schema_version(
+        self, conn: aiosqlite.Connection, version: int, commit: bool = True
+    ):
         """Update the schema version in the database."""
         await conn.execute(
             "INSERT INTO schema_version (version) VALUES (?)", (version,)
         )
-        await conn.commit()
+        if commit:
+            await conn.commit()
 
     async def _get_schema_version(self, conn: aiosqlite.Connection) -> int:
         """Get the current schema version."""
@@ -48,14 +70,98 @@ class MigrationManager:
         result = await cursor.fetchone()
         return result[0] if result[0] is not None else 0
 
-    # Example migration method (for future use)
     async def _migrate_to_v2(self, conn: aiosqlite.Connection):
-        """Example migration to version 2."""
-        # This is a placeholder for future migrations
-        # Example: Add a new column to users table
-        # await conn.execute("ALTER TABLE users ADD COLUMN new_column TEXT DEFAULT ''")
-        # await conn.commit()
-        pass
+        """Add the user_period_points rollup and backfill it from game sessions."""
+        await self.db_manager._create_period_points_table(conn)
+
+        await conn.execute("DELETE FROM user_period_points")
+        await conn.execute(
+            f"""
+            INSERT INTO user_period_points (user_id, period_type, period_start, points)
+            SELECT gs.user_id, 'week', DATE(gs.end_time, '-6 days', 'weekday 1'),
+                   SUM({SESSION_POINTS_SQL})
+            FROM game_sessions gs
+            JOIN questions q ON gs.question_id = q.id
+            WHERE gs.is_completed = 1 AND gs.end_time IS NOT NULL
+            GROUP BY gs.user_id, DATE(gs.end_time, '-6 days', 'weekday 1')
+            UNION ALL
+            SELECT gs.user_id, 'month', DATE(gs.end_time, 'start of month'),
+                   SUM({SESSION_POINTS_SQL})
+            FROM game_sessions gs
+            JOIN questions q ON gs.question_id = q.id
+            WHERE gs.is_completed = 1 AND gs.end_time IS NOT NULL
+            GROUP BY gs.user_id, DATE(gs.end_time, 'start of month')
+            """
+        )
+
+    async def _migrate_to_v3(self, conn: aiosqlite.Connection):
+        """Add the covering indexes used by the leaderboard queries."""
+        for index_name, table, columns, where in LEADERBOARD_INDEXES:
+            await safe_create_index(
+                conn, index_name, table, columns, where, commit=False
+            )
+
+    async def _migrate_to_v4(self, conn: aiosqlite.Connection):
+        """Snapshot user stats onto weekly_rankings so reads skip the users join."""
+        columns = ColumnAdder(conn)
+        for column in ("questions_answered", "questions_correct", "current_streak"):
+            await columns.add_column(
+                "weekly_rankings", column, "INTEGER", "0", commit=False
+            )
+
+    async def _migrate_to_v5(self, conn: aiosqlite.Connection):
+        """Index game sessions by user, newest first, for the per-user reads."""
+        await safe_create_index(
+            conn,
+            "idx_game_sessions_user_end",
+            "game_sessions",
+            "user_id, end_time, is_completed, question_id",
+            commit=False,
+        )
+
+    async def _migrate_to_v6(self, conn: aiosqlite.Connection):
+        """Add the user_category_stats table and backfill it from game sessions."""
+        await self.db_manager._create_category_stats_table(conn)
+
+        await conn.execute("DELETE FROM user_category_stats")
+        await conn.execute(
+            f"""
+            INSERT INTO user_category_stats (
+                user_id, category, difficulty, answered, correct, points
+            )
+            SELECT gs.user_id, q.category, q.difficulty, COUNT(*),
+                   SUM(CASE WHEN gs.is_completed = 1 THEN 1 ELSE 0 END),
+                   SUM(CASE WHEN gs.is_completed = 1
+                       THEN {SESSION_POINTS_SQL} ELSE 0 END)
+            FROM game_sessions gs
+            JOIN questions q ON gs.question_id = q.id
+            GROUP BY gs.user_id, q.category, q.difficulty
+            """
+        )
+
+    async def _migrate_to_v7(self, conn: aiosqlite.Connection):
+        """Add the users.recent_mask column and backfill it from game sessions."""
+        columns = ColumnAdder(conn)
+        await columns.add_column("users", "recent_mask", "INTEGER", "1", commit=False)
+
+        # Marker bit above the answer count, then each of the last 10
+        # answers at its recency position
+        await conn.execute(
+            """
+            UPDATE users SET recent_mask = (
+                SELECT (1 << COUNT(*)) | COALESCE(SUM(is_completed << (rn - 1)), 0)
+                FROM (
+                    SELECT is_completed,
+                           ROW_NUMBER() OVER (ORDER BY end_time DESC) as rn
+                    FROM game_sessions
+                    WHERE game_sessions.user_id = users.user_id
+                      AND question_id IS NOT NULL
+                    ORDER BY end_time DESC
+                    LIMIT 10
+                )
+            )
+            """
+        )
 
     async def create_migration_backup(self, version: int) -> str:
         """Create a backup before running migrations."""
@@ -70,43 +176,79 @@ class MigrationManager:
 
 
 # Migration utilities
+class ColumnAdder:
+    """Adds columns idempotently, reading each table's columns only once."""
+
+    def __init__(self, conn: aiosqlite.Connection):
+        self.conn = conn
+        self._columns: Dict[str, Set[str]] = {}
+
+    async def _get_columns(self, table: str) -> Set[str]:
+        """Get the column names of a table, querying SQLite on first use."""
+        if table not in self._columns:
+            cursor = await self.conn.execute(f"PRAGMA table_info({table})")
+            columns = await cursor.fetchall()
+            self._columns[table] = {col[1] for col in columns}
+        return self._columns[table]
+
+    async def add_column(
+        self,
+        table: str,
+        column: str,
+        column_type: str,
+        default_value: str = "",
+        commit: bool = True,
+    ):
+        """Add a column to a table if it doesn't exist."""
+        try:
+            column_names = await self._get_columns(table)
+
+            if column not in column_names:
+                await self.conn.execute(
+                    f"ALTER TABLE {table} ADD COLUMN {column} {column_type} DEFAULT {default_value}"
+                )
+                if commit:
+                    await self.conn.commit()
+                column_names.add(column)
+                logger.info(f"Added column {column} to table {table}")
+            else:
+                logger.info(f"Column {column} already exists in table {table}")
+
+        except Exception as e:
+            logger.error(f"Failed to add column {column} to table {table}: {e}")
+            raise
+
+
 async def safe_add_column(
     conn: aiosqlite.Connection,
     table: str,
     column: str,
     column_type: str,
     default_value: str = "",
+    commit: bool = True,
 ):
     """Safely add a column to a table if it doesn't exist."""
-    try:
-        # Check if column exists
-        cursor = await conn.execute(f"PRAGMA table_info({table})")
-        columns = await cursor.fetchall()
-        column_names = [col[1] for col in columns]
-
-        if column not in column_names:
-            await conn.execute(
-                f"ALTER TABLE {table} ADD COLUMN {column} {column_type} DEFAULT {default_value}"
-            )
-            await conn.commit()
-            logger.info(f"Added column {column} to table {table}")
-        else:
-            logger.info(f"Column {column} already exists in table {table}")
-
-    except Exception as e:
-        logger.error(f"Failed to add column {column} to table {table}: {e}")
-        raise
+    await ColumnAdder(conn).add_column(
+        table, column, column_type, default_value, commit=commit
+    )
 
 
 async def safe_create_index(
-    conn: aiosqlite.Connection, index_name: str, table: str, columns: str
+    conn: aiosqlite.Connection,
+    index_name: str,
+    table: str,
+    columns: str,
+    where: Optional[str] = None,
+    commit: bool = True,
 ):
-    """Safely create an index if it doesn't exist."""
+    """Safely create an index if it doesn't exist, optionally as a partial index."""
     try:
-        await conn.execute(
-            f"CREATE INDEX IF NOT EXISTS {index_name} ON {table} ({columns})"
-        )
-        await conn.commit()
+        index_sql = f"CREATE INDEX IF NOT EXISTS {index_name} ON {table} ({columns})"
+        if where:
+            index_sql += f" WHERE {where}"
+        await conn.execute(index_sql)
+        if commit:
+            await conn.commit()
         logger.info(f"Created index {index_name}")
     except Exception as e:
         logger.error(f"Failed to create index {index_name}: {e}")
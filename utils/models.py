@@ -5,11 +5,82 @@ Defines data structures and classes for database entities.
 
 from dataclasses import dataclass, field
 from datetime import datetime, date
-from typing import Optional, List, Dict, Any, Set
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Optional, List, Dict, Any, FrozenSet, Set, Tuple
 import json
+import re
+import sys
 
+# orjson is an optional speedup for the JSON-in-TEXT question columns
+try:
+    import orjson
 
-@dataclass
+    def _json_dumps(value: Any) -> str:
+        return orjson.dumps(value).decode()
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_dumps = json.dumps
+    _json_loads = json.loads
+
+# ciso8601 parses stored timestamps roughly twice as fast as the stdlib
+try:
+    from ciso8601 import parse_datetime as _parse_datetime
+except ImportError:
+    _parse_datetime = datetime.fromisoformat
+
+
+# Batch loads repeat the same week_start/created_at strings across rows, and
+# the parsed values are immutable, so one shared cache serves every model.
+@lru_cache(maxsize=4096)
+def _parse_datetime_cached(value: str) -> datetime:
+    """Parse a stored ISO timestamp, reusing earlier results."""
+    return _parse_datetime(value)
+
+
+@lru_cache(maxsize=1024)
+def _parse_date_cached(value: str) -> date:
+    """Parse a stored ISO date, reusing earlier results."""
+    return date.fromisoformat(value)
+
+
+# Punctuation that shouldn't affect fill-in-the-blank correctness
+_PUNCTUATION_TABLE = str.maketrans("", "", ".,!?;:")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def clean_answer_text(answer: str) -> str:
+    """Clean answer text for comparison (case-insensitive, remove extra spaces/punctuation)."""
+    if not answer:
+        return ""
+
+    # Convert to lowercase and remove extra whitespace
+    cleaned = answer.lower().strip()
+
+    # Remove common punctuation that shouldn't affect correctness
+    cleaned = cleaned.translate(_PUNCTUATION_TABLE)
+
+    # Replace multiple spaces with single space
+    cleaned = _WHITESPACE_RE.sub(" ", cleaned)
+
+    return cleaned
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    """Intern short enum-like strings so repeated values share one object."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+# Column order expected by UserProfile.from_row
+USER_PROFILE_COLUMNS = (
+    "user_id, total_points, questions_answered, questions_correct, "
+    "current_streak, best_streak, last_played, daily_challenge_completed, "
+    "weekly_challenge_completed, preferred_difficulty, created_at"
+)
+
+
+@dataclass(slots=True)
 class UserProfile:
     """User profile data model."""
 
@@ -25,6 +96,10 @@ class UserProfile:
     preferred_difficulty: Optional[str] = None
     created_at: Optional[datetime] = None
 
+    def __post_init__(self):
+        """Share one string object per difficulty across profiles."""
+        self.preferred_difficulty = _intern(self.preferred_difficulty)
+
     @property
     def accuracy_percentage(self) -> float:
         """Calculate accuracy percentage."""
@@ -52,29 +127,46 @@ class UserProfile:
             "created_at": self.created_at.isoformat() if self.created_at else None,
         }
 
+    @classmethod
+    def from_row(cls, row: tuple) -> "UserProfile":
+        """Create UserProfile from a users row selected with USER_PROFILE_COLUMNS."""
+        return cls(
+            row[0],
+            row[1] or 0,
+            row[2] or 0,
+            row[3] or 0,
+            row[4] or 0,
+            row[5] or 0,
+            _parse_datetime_cached(row[6]) if row[6] else None,
+            _parse_date_cached(row[7]) if row[7] else None,
+            _parse_date_cached(row[8]) if row[8] else None,
+            row[9],
+            _parse_datetime_cached(row[10]) if row[10] else None,
+        )
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "UserProfile":
         """Create UserProfile from dictionary."""
         # Handle datetime parsing
         last_played = None
         if data.get("last_played"):
-            last_played = datetime.fromisoformat(data["last_played"])
+            last_played = _parse_datetime_cached(data["last_played"])
 
         daily_challenge_completed = None
         if data.get("daily_challenge_completed"):
-            daily_challenge_completed = date.fromisoformat(
+            daily_challenge_completed = _parse_date_cached(
                 data["daily_challenge_completed"]
             )
 
         weekly_challenge_completed = None
         if data.get("weekly_challenge_completed"):
-            weekly_challenge_completed = date.fromisoformat(
+            weekly_challenge_completed = _parse_date_cached(
                 data["weekly_challenge_completed"]
             )
 
         created_at = None
         if data.get("created_at"):
-            created_at = datetime.fromisoformat(data["created_at"])
+            created_at = _parse_datetime_cached(data["created_at"])
 
         return cls(
             user_id=data["user_id"],
@@ -91,7 +183,7 @@ class UserProfile:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Question:
     """Question data model."""
 
@@ -110,12 +202,32 @@ class Question:
     times_asked: int = 0
     times_correct: int = 0
     created_at: Optional[datetime] = None
+    # Lowercased options and correct answer for answer validation
+    normalized_options: Tuple[str, ...] = field(
+        default=(), init=False, repr=False, compare=False
+    )
+    normalized_answer: str = field(default="", init=False, repr=False, compare=False)
+    # Cleaned correct answer and variations for fill-in-the-blank validation
+    accepted_answers: FrozenSet[str] = field(
+        default=frozenset(), init=False, repr=False, compare=False
+    )
 
     def __post_init__(self):
-        """Set default point values based on difficulty."""
+        """Intern enum-like fields and set default point values based on difficulty."""
+        self.question_type = _intern(self.question_type)
+        self.difficulty = _intern(self.difficulty)
+        self.category = _intern(self.category)
         if self.point_value == 0:
-            point_values = {"easy": 10, "medium": 20, "hard": 30}
-            self.point_value = point_values.get(self.difficulty, 20)
+            self.point_value = POINT_VALUES.get(self.difficulty, 20)
+        self.normalized_options = tuple(
+            option.lower().strip() for option in self.options or ()
+        )
+        self.normalized_answer = self.correct_answer.lower().strip()
+        if self.question_type == "fill_blank":
+            self.accepted_answers = frozenset(
+                clean_answer_text(answer)
+                for answer in (self.correct_answer, *(self.answer_variations or ()))
+            )
 
     @property
     def success_rate(self) -> float:
@@ -133,8 +245,8 @@ class Question:
             "difficulty": self.difficulty,
             "category": self.category,
             "correct_answer": self.correct_answer,
-            "options": json.dumps(self.options) if self.options else None,
-            "answer_variations": json.dumps(self.answer_variations)
+            "options": _json_dumps(self.options) if self.options else None,
+            "answer_variations": _json_dumps(self.answer_variations)
             if self.answer_variations
             else None,
             "explanation": self.explanation,
@@ -149,15 +261,15 @@ class Question:
         """Create Question from dictionary."""
         options = None
         if data.get("options"):
-            options = json.loads(data["options"])
+            options = _json_loads(data["options"])
 
         answer_variations = None
         if data.get("answer_variations"):
-            answer_variations = json.loads(data["answer_variations"])
+            answer_variations = _json_loads(data["answer_variations"])
 
         created_at = None
         if data.get("created_at"):
-            created_at = datetime.fromisoformat(data["created_at"])
+            created_at = _parse_datetime_cached(data["created_at"])
 
         return cls(
             id=data.get("id"),
@@ -176,7 +288,7 @@ class Question:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class UserAchievement:
     """User achievement data model."""
 
@@ -199,7 +311,7 @@ class UserAchievement:
         """Create UserAchievement from dictionary."""
         unlocked_at = None
         if data.get("unlocked_at"):
-            unlocked_at = datetime.fromisoformat(data["unlocked_at"])
+            unlocked_at = _parse_datetime_cached(data["unlocked_at"])
 
         return cls(
             id=data.get("id"),
@@ -209,7 +321,7 @@ class UserAchievement:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class WeeklyRanking:
     """Weekly ranking data model."""
 
@@ -234,7 +346,7 @@ class WeeklyRanking:
         """Create WeeklyRanking from dictionary."""
         week_start = None
         if data.get("week_start"):
-            week_start = date.fromisoformat(data["week_start"])
+            week_start = _parse_date_cached(data["week_start"])
 
         return cls(
             id=data.get("id"),
@@ -245,7 +357,7 @@ class WeeklyRanking:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class GameSession:
     """Game session data model for tracking active games."""
 
@@ -283,11 +395,11 @@ class GameSession:
         """Create GameSession from dictionary."""
         start_time = None
         if data.get("start_time"):
-            start_time = datetime.fromisoformat(data["start_time"])
+            start_time = _parse_datetime_cached(data["start_time"])
 
         end_time = None
         if data.get("end_time"):
-            end_time = datetime.fromisoformat(data["end_time"])
+            end_time = _parse_datetime_cached(data["end_time"])
 
         return cls(
             id=data.get("id"),
@@ -302,7 +414,7 @@ class GameSession:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class AnswerResult:
     """Result of processing a user's answer."""
 
@@ -314,7 +426,7 @@ class AnswerResult:
     explanation: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class UserStats:
     """Comprehensive user statistics."""
 
@@ -328,6 +440,7 @@ class UserStats:
     rank_change: Optional[int] = None
 
 
+# Not slotted, so entries keep accepting ad-hoc derived metrics
 @dataclass
 class LeaderboardEntry:
     """Leaderboard entry data model."""
@@ -343,45 +456,57 @@ class LeaderboardEntry:
 
 
 # Constants for question types and difficulties
-QUESTION_TYPES = ["multiple_choice", "true_false", "fill_blank"]
-DIFFICULTY_LEVELS = ["easy", "medium", "hard"]
-POINT_VALUES = {"easy": 10, "medium": 20, "hard": 30}
+QUESTION_TYPES = ("multiple_choice", "true_false", "fill_blank")
+DIFFICULTY_LEVELS = ("easy", "medium", "hard")
+POINT_VALUES = MappingProxyType({"easy": 10, "medium": 20, "hard": 30})
 
 # Achievement definitions
-ACHIEVEMENTS = {
-    "hot_streak": {
-        "name": "Hot Streak",
-        "description": "Answer 5 questions correctly in a row",
-        "requirement": {"type": "streak", "value": 5},
-        "reward_points": 50,
-        "emoji": "🔥",
-    },
-    "galaxy_expert": {
-        "name": "Galaxy Expert",
-        "description": "Answer 10 questions correctly in a row",
-        "requirement": {"type": "streak", "value": 10},
-        "reward_points": 100,
-        "emoji": "⭐",
-    },
-    "dedicated_fan": {
-        "name": "Dedicated Fan",
-        "description": "Play trivia for 7 consecutive days",
-        "requirement": {"type": "daily_streak", "value": 7},
-        "reward_points": 200,
-        "emoji": "💙",
-    },
-    "trivia_master": {
-        "name": "Trivia Master",
-        "description": "Answer 100 questions correctly",
-        "requirement": {"type": "total_correct", "value": 100},
-        "reward_points": 500,
-        "emoji": "👑",
-    },
-    "perfectionist": {
-        "name": "Perfectionist",
-        "description": "Maintain 90% accuracy over 50 questions",
-        "requirement": {"type": "accuracy", "value": 90, "min_questions": 50},
-        "reward_points": 300,
-        "emoji": "💯",
-    },
-}
+ACHIEVEMENTS = MappingProxyType(
+    {
+        "hot_streak": {
+            "name": "Hot Streak",
+            "description": "Answer 5 questions correctly in a row",
+            "requirement": {"type": "streak", "value": 5},
+            "reward_points": 50,
+            "emoji": "🔥",
+        },
+        "galaxy_expert": {
+            "name": "Galaxy Expert",
+            "description": "Answer 10 questions correctly in a row",
+            "requirement": {"type": "streak", "value": 10},
+            "reward_points": 100,
+            "emoji": "⭐",
+        },
+        "dedicated_fan": {
+            "name": "Dedicated Fan",
+            "description": "Play trivia for 7 consecutive days",
+            "requirement": {"type": "daily_streak", "value": 7},
+            "reward_points": 200,
+            "emoji": "💙",
+        },
+        "trivia_master": {
+            "name": "Trivia Master",
+            "description": "Answer 100 questions correctly",
+            "requirement": {"type": "total_correct", "value": 100},
+            "reward_points": 500,
+            "emoji": "👑",
+        },
+        "perfectionist": {
+            "name": "Perfectionist",
+            "description": "Maintain 90% accuracy over 50 questions",
+            "requirement": {"type": "accuracy", "value": 90, "min_questions": 50},
+            "reward_points": 300,
+            "emoji": "💯",
+        },
+    }
+)
+
+# (threshold, achievement_id) for streak achievements, lowest threshold first,
+# so the per-answer streak check is a short scan over plain tuples
+STREAK_ACHIEVEMENTS: Tuple[Tuple[int, str], ...] = tuple(
+    sorted(
+        (achievement["requirement"]["value"], achievement_id)
+        for achievement_id, achievement in ACHIEVEMENTS.items()
+        if achievement["requirement"]["type"] == "streak"
+    )
+)
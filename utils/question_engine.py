@@ -4,12 +4,42 @@ Handles question selection, validation, and formatting for different question ty
 """
 
 import random
-import re
-from typing import Optional, List, Dict, Any
-from datetime import date
-from utils.models import Question, QUESTION_TYPES, DIFFICULTY_LEVELS, POINT_VALUES
+import sys
+from collections import Counter
+from dataclasses import replace
+from typing import Optional, List, Dict, Any, Tuple
+from datetime import date, timedelta
+from utils.models import (
+    Question,
+    QUESTION_TYPES,
+    DIFFICULTY_LEVELS,
+    POINT_VALUES,
+    clean_answer_text,
+)
 from data.trivia_questions import QUESTIONS
 
+# Embed colors per difficulty
+_DIFFICULTY_COLORS = {
+    "easy": 0x00FF00,  # Green
+    "medium": 0xFFFF00,  # Yellow
+    "hard": 0xFF0000,  # Red
+}
+_DEFAULT_COLOR = 0x0099FF  # Blue
+
+# Reaction emojis for multiple choice options, in option order
+_OPTION_EMOJIS = ("🇦", "🇧", "🇨", "🇩")
+_MULTIPLE_CHOICE_FOOTER = "React with 🇦, 🇧, 🇨, or 🇩 to answer!"
+
+# Accepted spellings for true/false answers
+_TRUE_ANSWERS = frozenset({"true", "t", "yes", "y", "1", "✅"})
+_FALSE_ANSWERS = frozenset({"false", "f", "no", "n", "0", "❌"})
+_CORRECT_TRUE_VALUES = frozenset({"true", "t", "yes", "y", "1"})
+
+
+def _intern_strings(values: List[Any]) -> List[Any]:
+    """Intern the strings in an option list so repeated options share one object."""
+    return [sys.intern(value) if isinstance(value, str) else value for value in values]
+
 
 class QuestionEngine:
     """
@@ -20,6 +50,13 @@ class QuestionEngine:
     def __init__(self):
         """Initialize the Question Engine."""
         self._questions_cache = {}
+        # (difficulty, question_type or None, category or None) -> questions
+        self._question_index: Dict[
+            Tuple[str, Optional[str], Optional[str]], List[Question]
+        ] = {}
+        self._indexed_cache = None
+        self._next_question_id = 1
+        self._question_stats: Optional[Dict[str, Any]] = None
         self._daily_challenge_cache = {}
         self._weekly_challenge_cache = {}
         self._load_questions()
@@ -33,6 +70,36 @@ class QuestionEngine:
                 question = self._convert_to_question_object(question_data)
                 self._questions_cache[difficulty].append(question)
 
+        self._build_question_index()
+
+    def _build_question_index(self) -> None:
+        """Index the question pool by every filter combination get_question accepts."""
+        self._question_index = {}
+        max_id = 0
+        for difficulty, questions in self._questions_cache.items():
+            for question in questions:
+                self._index_question(difficulty, question)
+                if question.id and question.id > max_id:
+                    max_id = question.id
+        self._next_question_id = max_id + 1
+        self._question_stats = None
+        self._indexed_cache = self._questions_cache
+
+    def _ensure_question_index(self) -> None:
+        """Rebuild the index if the question pool was replaced wholesale."""
+        if self._indexed_cache is not self._questions_cache:
+            self._build_question_index()
+
+    def _index_question(self, difficulty: str, question: Question) -> None:
+        """Add a question to the index entries it matches."""
+        for key in (
+            (difficulty, None, None),
+            (difficulty, question.question_type, None),
+            (difficulty, None, question.category),
+            (difficulty, question.question_type, question.category),
+        ):
+            self._question_index.setdefault(key, []).append(question)
+
     def _convert_to_question_object(self, question_data: Dict[str, Any]) -> Question:
         """Convert question data dictionary to Question object."""
         # Handle different answer formats from the data
@@ -50,15 +117,20 @@ class QuestionEngine:
         elif question_data.get("question_type") == "true_false":
             correct_answer = str(correct_answer).lower()
 
+        options = question_data.get("options")
+        answer_variations = question_data.get("answer_variations", [])
+
         return Question(
             id=question_data.get("id"),
             question_text=question_data.get("question", ""),
             question_type=question_data.get("question_type", "multiple_choice"),
             difficulty=question_data.get("difficulty", "medium"),
             category=question_data.get("category", "general"),
-            correct_answer=str(correct_answer),
-            options=question_data.get("options"),
-            answer_variations=question_data.get("answer_variations", []),
+            correct_answer=sys.intern(str(correct_answer)),
+            options=_intern_strings(options) if options else options,
+            answer_variations=_intern_strings(answer_variations)
+            if answer_variations
+            else answer_variations,
             explanation=question_data.get("explanation"),
             point_value=question_data.get(
                 "point_value",
@@ -93,41 +165,21 @@ class QuestionEngine:
         if difficulty not in DIFFICULTY_LEVELS:
             difficulty = "medium"
 
-        # Get questions for the specified difficulty
-        available_questions = self._questions_cache.get(difficulty, [])
+        self._ensure_question_index()
 
-        # Filter by question type if specified
-        if question_type and question_type in QUESTION_TYPES:
-            available_questions = [
-                q for q in available_questions if q.question_type == question_type
-            ]
-
-        # Filter by category if specified
-        if category:
-            available_questions = [
-                q for q in available_questions if q.category == category
-            ]
+        # Look up the questions matching every requested filter
+        if question_type not in QUESTION_TYPES:
+            question_type = None
+        available_questions = self._question_index.get(
+            (difficulty, question_type, category or None)
+        )
 
         # Return random question from filtered list
         if available_questions:
             question = random.choice(available_questions)
-            # Create a copy to avoid modifying the cached version
-            return Question(
-                id=question.id,
-                question_text=question.question_text,
-                question_type=question.question_type,
-                difficulty=question.difficulty,
-                category=question.category,
-                correct_answer=question.correct_answer,
-                options=question.options.copy() if question.options else None,
-                answer_variations=question.answer_variations.copy()
-                if question.answer_variations
-                else None,
-                explanation=question.explanation,
-                point_value=question.point_value,
-                times_asked=question.times_asked,
-                times_correct=question.times_correct,
-            )
+            # Return a shallow copy so callers can adjust scores without
+            # touching the cached question; option lists are never mutated
+            return replace(question)
 
         return None
 
@@ -146,11 +198,18 @@ class QuestionEngine:
             return self._daily_challenge_cache[today]
 
         # Select a hard question for daily challenge
-        question = await self.get_question(difficulty="hard")
-        if question:
-            # Double the points for daily challenge
-            question.point_value *= 2
-            self._daily_challenge_cache[today] = question
+        self._ensure_question_index()
+        pool = self._question_index.get(("hard", None, None))
+        if not pool:
+            return None
+
+        # Double the points for daily challenge
+        base_question = random.choice(pool)
+        question = replace(base_question, point_value=base_question.point_value * 2)
+
+        # Only today's entry is ever read, so drop earlier days
+        self._daily_challenge_cache.clear()
+        self._daily_challenge_cache[today] = question
 
         return question
 
@@ -164,32 +223,27 @@ class QuestionEngine:
         """
         # Get the start of the current week (Monday)
         today = date.today()
-        days_since_monday = today.weekday()
-        week_start = today.replace(day=today.day - days_since_monday).isoformat()
+        week_start = (today - timedelta(days=today.weekday())).isoformat()
 
         # Check if we already have this week's questions cached
         if week_start in self._weekly_challenge_cache:
             return self._weekly_challenge_cache[week_start]
 
-        # Select 5 questions: 2 medium, 3 hard
-        questions = []
-
-        # Get 2 medium questions
-        for _ in range(2):
-            question = await self.get_question(difficulty="medium")
-            if question:
-                question.point_value *= 3  # Triple points for weekly challenge
-                questions.append(question)
+        self._ensure_question_index()
 
-        # Get 3 hard questions
-        for _ in range(3):
-            question = await self.get_question(difficulty="hard")
-            if question:
-                question.point_value *= 3  # Triple points for weekly challenge
-                questions.append(question)
+        # Select 5 distinct questions: 2 medium, 3 hard
+        questions = []
+        for difficulty, count in (("medium", 2), ("hard", 3)):
+            pool = self._question_index.get((difficulty, None, None), [])
+            for question in random.sample(pool, min(count, len(pool))):
+                # Triple points for weekly challenge
+                questions.append(
+                    replace(question, point_value=question.point_value * 3)
+                )
 
         # Cache the questions for the week
         if questions:
+            self._weekly_challenge_cache.clear()
             self._weekly_challenge_cache[week_start] = questions
 
         return questions
@@ -225,83 +279,40 @@ class QuestionEngine:
         if not question.options:
             return False
 
-        user_answer_lower = user_answer.lower().strip()
-        correct_answer_lower = question.correct_answer.lower().strip()
+        options_lower = question.normalized_options
+        correct_answer_lower = question.normalized_answer
 
         # Check if user_answer is an index (0-3)
         try:
             answer_index = int(user_answer)
-            if 0 <= answer_index < len(question.options):
-                return (
-                    question.options[answer_index].lower().strip()
-                    == correct_answer_lower
-                )
+            if 0 <= answer_index < len(options_lower):
+                return options_lower[answer_index] == correct_answer_lower
         except ValueError:
             pass
 
-        # Check if user answer matches the correct answer directly
-        if user_answer_lower == correct_answer_lower:
-            return True
-
-        # Check if user answer matches any option and that option is correct
-        for option in question.options:
-            if option.lower().strip() == user_answer_lower:
-                return option.lower().strip() == correct_answer_lower
-
-        return False
+        # Otherwise the answer text itself has to be the correct option
+        return user_answer.lower().strip() == correct_answer_lower
 
     def _validate_true_false(self, question: Question, user_answer: str) -> bool:
         """Validate true/false answer."""
         user_answer_lower = user_answer.lower()
-        correct_answer_lower = question.correct_answer.lower()
+        correct_is_true = question.correct_answer.lower() in _CORRECT_TRUE_VALUES
 
         # Handle various true/false representations
-        true_values = ["true", "t", "yes", "y", "1", "✅"]
-        false_values = ["false", "f", "no", "n", "0", "❌"]
-
-        user_is_true = user_answer_lower in true_values
-        user_is_false = user_answer_lower in false_values
-
-        correct_is_true = correct_answer_lower in ["true", "t", "yes", "y", "1"]
-
-        if user_is_true:
+        if user_answer_lower in _TRUE_ANSWERS:
             return correct_is_true
-        elif user_is_false:
+        elif user_answer_lower in _FALSE_ANSWERS:
             return not correct_is_true
 
         return False
 
     def _validate_fill_blank(self, question: Question, user_answer: str) -> bool:
         """Validate fill-in-the-blank answer."""
-        user_answer_clean = self._clean_answer(user_answer)
-
-        # Check against the main correct answer
-        if self._clean_answer(question.correct_answer) == user_answer_clean:
-            return True
-
-        # Check against answer variations if available
-        if question.answer_variations:
-            for variation in question.answer_variations:
-                if self._clean_answer(variation) == user_answer_clean:
-                    return True
-
-        return False
+        return self._clean_answer(user_answer) in question.accepted_answers
 
     def _clean_answer(self, answer: str) -> str:
         """Clean answer text for comparison (case-insensitive, remove extra spaces/punctuation)."""
-        if not answer:
-            return ""
-
-        # Convert to lowercase and remove extra whitespace
-        cleaned = answer.lower().strip()
-
-        # Remove common punctuation that shouldn't affect correctness
-        cleaned = re.sub(r"[.,!?;:]", "", cleaned)
-
-        # Replace multiple spaces with single space
-        cleaned = re.sub(r"\s+", " ", cleaned)
-
-        return cleaned
+        return clean_answer_text(answer)
 
     def format_question_for_discord(self, question: Question) -> Dict[str, Any]:
         """
@@ -350,16 +361,14 @@ class QuestionEngine:
         if not question.options:
             return {}
 
-        options_text = ""
-        emojis = ["🇦", "🇧", "🇨", "🇩"]
-
-        for i, option in enumerate(question.options):
-            if i < len(emojis):
-                options_text += f"{emojis[i]} {option}\n"
+        options_text = "".join(
+            f"{emoji} {option}\n"
+            for emoji, option in zip(_OPTION_EMOJIS, question.options)
+        )
 
         return {
             "fields": [{"name": "Options", "value": options_text, "inline": False}],
-            "footer": {"text": "React with 🇦, 🇧, 🇨, or 🇩 to answer!"},
+            "footer": {"text": _MULTIPLE_CHOICE_FOOTER},
         }
 
     def _format_true_false(self, question: Question) -> Dict[str, Any]:
@@ -372,12 +381,7 @@ class QuestionEngine:
 
     def _get_difficulty_color(self, difficulty: str) -> int:
         """Get color code for difficulty level."""
-        colors = {
-            "easy": 0x00FF00,  # Green
-            "medium": 0xFFFF00,  # Yellow
-            "hard": 0xFF0000,  # Red
-        }
-        return colors.get(difficulty, 0x0099FF)  # Default blue
+        return _DIFFICULTY_COLORS.get(difficulty, _DEFAULT_COLOR)
 
     async def add_custom_question(self, question_data: Dict[str, Any]) -> bool:
         """
@@ -413,15 +417,15 @@ class QuestionEngine:
             # Add to appropriate difficulty cache
             difficulty = question.difficulty
             if difficulty in self._questions_cache:
+                self._ensure_question_index()
+
                 # Assign a new ID (simple incremental approach)
-                max_id = 0
-                for diff_questions in self._questions_cache.values():
-                    for q in diff_questions:
-                        if q.id and q.id > max_id:
-                            max_id = q.id
-                question.id = max_id + 1
+                question.id = self._next_question_id
+                self._next_question_id += 1
 
                 self._questions_cache[difficulty].append(question)
+                self._index_question(difficulty, question)
+                self._question_stats = None
                 return True
 
         except Exception as e:
@@ -436,28 +440,28 @@ class QuestionEngine:
         Returns:
             Dictionary containing question pool statistics.
         """
+        # The pool only changes through add_custom_question, so reuse the
+        # last count until it (or a replaced pool) invalidates it
+        self._ensure_question_index()
+        if self._question_stats is not None:
+            return self._question_stats
+
+        all_questions = [
+            question
+            for questions in self._questions_cache.values()
+            for question in questions
+        ]
         stats = {
-            "total_questions": 0,
-            "by_difficulty": {},
-            "by_type": {},
-            "by_category": {},
+            "total_questions": len(all_questions),
+            "by_difficulty": {
+                difficulty: len(questions)
+                for difficulty, questions in self._questions_cache.items()
+            },
+            "by_type": dict(Counter(q.question_type for q in all_questions)),
+            "by_category": dict(Counter(q.category for q in all_questions)),
         }
 
-        for difficulty, questions in self._questions_cache.items():
-            stats["by_difficulty"][difficulty] = len(questions)
-            stats["total_questions"] += len(questions)
-
-            for question in questions:
-                # Count by type
-                q_type = question.question_type
-                stats["by_type"][q_type] = stats["by_type"].get(q_type, 0) + 1
-
-                # Count by category
-                category = question.category
-                stats["by_category"][category] = (
-                    stats["by_category"].get(category, 0) + 1
-                )
-
+        self._question_stats = stats
         return stats
 
     def clear_daily_cache(self) -> None:
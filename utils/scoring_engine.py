@@ -4,19 +4,69 @@ Handles difficulty-based point calculation, streak tracking, and bonus calculati
 """
 
 import logging
+from bisect import bisect_left, bisect_right
 from datetime import datetime, timedelta
+from operator import itemgetter
+from types import MappingProxyType
 from typing import Dict, Any, Optional, List, Tuple
-from utils.models import POINT_VALUES, ACHIEVEMENTS
+from utils.models import POINT_VALUES, ACHIEVEMENTS, STREAK_ACHIEVEMENTS
 
 logger = logging.getLogger(__name__)
 
+# Upper bounds (as a fraction of the time limit) for each speed bonus tier
+_TIME_BONUS_THRESHOLDS = (0.17, 0.33, 0.67)
+_TIME_BONUS_MULTIPLIERS = (1.5, 1.3, 1.1, 1.0)
+
+# Score fields for an incorrect answer; copied per call so callers can mutate them
+_ZERO_SCORE = MappingProxyType(
+    {
+        "base_points": 0,
+        "time_bonus_multiplier": 1.0,
+        "streak_bonus": 0,
+        "difficulty_bonus_multiplier": 1.0,
+        "challenge_multiplier": 1.0,
+        "total_points": 0,
+    }
+)
+
+
+def _milestones_for(requirement_type: str) -> Tuple[Tuple[int, str], ...]:
+    """Return (value, name) pairs for one achievement requirement type, lowest first."""
+    return tuple(
+        sorted(
+            (achievement["requirement"]["value"], achievement["name"])
+            for achievement in ACHIEVEMENTS.values()
+            if achievement["requirement"]["type"] == requirement_type
+        )
+    )
+
 
 class ScoringEngine:
     """Manages scoring calculations, streak tracking, and bonus point systems."""
 
+    __slots__ = (
+        "base_point_values",
+        "achievements",
+        "streak_achievements",
+        "_progress_handlers",
+        "_streak_milestones",
+        "_total_correct_milestones",
+        "_accuracy_milestones",
+    )
+
     def __init__(self):
         self.base_point_values = POINT_VALUES
         self.achievements = ACHIEVEMENTS
+        self.streak_achievements = STREAK_ACHIEVEMENTS
+        self._progress_handlers = {
+            "streak": self._streak_progress,
+            "total_correct": self._total_correct_progress,
+            "accuracy": self._accuracy_progress,
+            "daily_streak": self._no_progress,
+        }
+        self._streak_milestones = _milestones_for("streak")
+        self._total_correct_milestones = _milestones_for("total_correct")
+        self._accuracy_milestones = _milestones_for("accuracy")
 
     def calculate_base_points(self, difficulty: str, is_correct: bool) -> int:
         """Calculate base points for a question based on difficulty."""
@@ -35,16 +85,9 @@ class ScoringEngine:
         # Answered in 10 seconds = 1.3x multiplier
         # Answered in 20 seconds = 1.1x multiplier
         # Answered in 30 seconds = 1.0x multiplier
-
-        time_ratio = time_taken / max_time
-        if time_ratio <= 0.17:  # First 5 seconds (5/30)
-            return 1.5
-        elif time_ratio <= 0.33:  # First 10 seconds
-            return 1.3
-        elif time_ratio <= 0.67:  # First 20 seconds
-            return 1.1
-        else:
-            return 1.0
+        return _TIME_BONUS_MULTIPLIERS[
+            bisect_left(_TIME_BONUS_THRESHOLDS, time_taken / max_time)
+        ]
 
     def calculate_streak_bonus(self, current_streak: int) -> int:
         """Calculate bonus points for answer streaks."""
@@ -82,83 +125,75 @@ class ScoringEngine:
         user_accuracy: float = 0.0,
         max_time: int = 30,
         is_challenge: bool = False,
+        include_breakdown: bool = True,
     ) -> Dict[str, Any]:
-        """Calculate total score with all bonuses and multipliers."""
-        result = {
-            "base_points": 0,
-            "time_bonus_multiplier": 1.0,
-            "streak_bonus": 0,
-            "difficulty_bonus_multiplier": 1.0,
-            "challenge_multiplier": 1.0,
-            "total_points": 0,
-            "breakdown": [],
-        }
+        """Calculate total score with all bonuses and multipliers.
 
+        Pass include_breakdown=False when only the numbers are needed to skip
+        building the human-readable breakdown lines.
+        """
         if not is_correct:
-            result["breakdown"].append("Incorrect answer: 0 points")
-            return result
+            return {
+                **_ZERO_SCORE,
+                "breakdown": ["Incorrect answer: 0 points"]
+                if include_breakdown
+                else [],
+            }
 
-        # Base points
         base_points = self.calculate_base_points(difficulty, is_correct)
-        result["base_points"] = base_points
-        result["breakdown"].append(f"Base points ({difficulty}): {base_points}")
-
-        # Time bonus
         time_multiplier = self.calculate_time_bonus(time_taken, max_time)
-        result["time_bonus_multiplier"] = time_multiplier
-        if time_multiplier > 1.0:
-            result["breakdown"].append(f"Speed bonus: {time_multiplier:.1f}x")
-
-        # Streak bonus
         streak_bonus = self.calculate_streak_bonus(current_streak)
-        result["streak_bonus"] = streak_bonus
-        if streak_bonus > 0:
-            result["breakdown"].append(
-                f"Streak bonus ({current_streak} streak): +{streak_bonus}"
-            )
-
-        # Difficulty progression bonus
         difficulty_multiplier = self.calculate_difficulty_progression_bonus(
             difficulty, user_accuracy
         )
-        result["difficulty_bonus_multiplier"] = difficulty_multiplier
-        if difficulty_multiplier > 1.0:
-            result["breakdown"].append(
-                f"Difficulty mastery bonus: {difficulty_multiplier:.1f}x"
-            )
-
-        # Challenge multiplier
-        if is_challenge:
-            result["challenge_multiplier"] = 2.0  # Double points for challenges
-            result["breakdown"].append("Challenge bonus: 2.0x")
+        # Double points for challenges
+        challenge_multiplier = 2.0 if is_challenge else 1.0
 
-        # Calculate total
         total_points = (
             int(
                 base_points
                 * time_multiplier
                 * difficulty_multiplier
-                * result["challenge_multiplier"]
+                * challenge_multiplier
             )
             + streak_bonus
         )
 
-        result["total_points"] = total_points
-        result["breakdown"].append(f"Total: {total_points} points")
-
-        return result
+        breakdown: List[str] = []
+        if include_breakdown:
+            breakdown.append(f"Base points ({difficulty}): {base_points}")
+            if time_multiplier > 1.0:
+                breakdown.append(f"Speed bonus: {time_multiplier:.1f}x")
+            if streak_bonus > 0:
+                breakdown.append(
+                    f"Streak bonus ({current_streak} streak): +{streak_bonus}"
+                )
+            if difficulty_multiplier > 1.0:
+                breakdown.append(
+                    f"Difficulty mastery bonus: {difficulty_multiplier:.1f}x"
+                )
+            if is_challenge:
+                breakdown.append("Challenge bonus: 2.0x")
+            breakdown.append(f"Total: {total_points} points")
+
+        return {
+            "base_points": base_points,
+            "time_bonus_multiplier": time_multiplier,
+            "streak_bonus": streak_bonus,
+            "difficulty_bonus_multiplier": difficulty_multiplier,
+            "challenge_multiplier": challenge_multiplier,
+            "total_points": total_points,
+            "breakdown": breakdown,
+        }
 
     def check_streak_achievements(self, current_streak: int, user_id: int) -> List[str]:
         """Check if current streak qualifies for any achievements."""
         unlocked_achievements = []
 
-        for achievement_id, achievement_data in self.achievements.items():
-            requirement = achievement_data.get("requirement", {})
-
-            if requirement.get("type") == "streak":
-                required_streak = requirement.get("value", 0)
-                if current_streak >= required_streak:
-                    unlocked_achievements.append(achievement_id)
+        for required_streak, achievement_id in self.streak_achievements:
+            if current_streak < required_streak:
+                break
+            unlocked_achievements.append(achievement_id)
 
         return unlocked_achievements
 
@@ -193,21 +228,18 @@ class ScoringEngine:
             # Difficulty analysis
             difficulty_breakdown = user_stats.get("difficulty_breakdown", {})
             if difficulty_breakdown:
-                difficulty_scores = {}
+                best_score = worst_score = None
                 for difficulty, stats in difficulty_breakdown.items():
-                    if stats.get("total", 0) > 0:
-                        accuracy = (
-                            stats.get("correct", 0) / stats.get("total", 1)
-                        ) * 100
-                        difficulty_scores[difficulty] = accuracy
-
-                if difficulty_scores:
-                    analytics["strongest_difficulty"] = max(
-                        difficulty_scores, key=difficulty_scores.get
-                    )
-                    analytics["weakest_difficulty"] = min(
-                        difficulty_scores, key=difficulty_scores.get
-                    )
+                    total = stats.get("total", 0)
+                    if total <= 0:
+                        continue
+                    score = stats.get("correct", 0) / total * 100
+                    if best_score is None or score > best_score:
+                        best_score = score
+                        analytics["strongest_difficulty"] = difficulty
+                    if worst_score is None or score < worst_score:
+                        worst_score = score
+                        analytics["weakest_difficulty"] = difficulty
 
             # Improvement suggestions
             if accuracy < 70:
@@ -227,9 +259,12 @@ class ScoringEngine:
                 )
 
             # Achievement progress
+            user_profile = user_stats.get("user_profile", {})
             for achievement_id, achievement_data in self.achievements.items():
                 requirement = achievement_data.get("requirement", {})
-                progress = self._calculate_achievement_progress(requirement, user_stats)
+                progress = self._calculate_achievement_progress(
+                    requirement, user_stats, user_profile
+                )
                 if progress < 100:  # Only show incomplete achievements
                     analytics["achievement_progress"][achievement_id] = {
                         "name": achievement_data.get("name", ""),
@@ -259,46 +294,73 @@ class ScoringEngine:
         return analytics
 
     def _calculate_achievement_progress(
-        self, requirement: Dict[str, Any], user_stats: Dict[str, Any]
+        self,
+        requirement: Dict[str, Any],
+        user_stats: Dict[str, Any],
+        user_profile: Optional[Dict[str, Any]] = None,
     ) -> float:
         """Calculate progress towards a specific achievement."""
-        req_type = requirement.get("type")
-        req_value = requirement.get("value", 1)
+        if user_profile is None:
+            user_profile = user_stats.get("user_profile", {})
 
-        user_profile = user_stats.get("user_profile", {})
+        handler = self._progress_handlers.get(
+            requirement.get("type"), self._no_progress
+        )
+        return handler(requirement, user_stats, user_profile)
 
-        if req_type == "streak":
-            current_streak = user_profile.get("current_streak", 0)
-            return min(100, (current_streak / req_value) * 100)
+    def _streak_progress(
+        self,
+        requirement: Dict[str, Any],
+        user_stats: Dict[str, Any],
+        user_profile: Dict[str, Any],
+    ) -> float:
+        """Progress towards a current-streak achievement."""
+        current_streak = user_profile.get("current_streak", 0)
+        return min(100, (current_streak / requirement.get("value", 1)) * 100)
 
-        elif req_type == "total_correct":
-            questions_correct = user_profile.get("questions_correct", 0)
-            return min(100, (questions_correct / req_value) * 100)
+    def _total_correct_progress(
+        self,
+        requirement: Dict[str, Any],
+        user_stats: Dict[str, Any],
+        user_profile: Dict[str, Any],
+    ) -> float:
+        """Progress towards a total-correct-answers achievement."""
+        questions_correct = user_profile.get("questions_correct", 0)
+        return min(100, (questions_correct / requirement.get("value", 1)) * 100)
 
-        elif req_type == "accuracy":
-            accuracy = user_stats.get("accuracy_percentage", 0)
-            min_questions = requirement.get("min_questions", 1)
-            questions_answered = user_profile.get("questions_answered", 0)
-
-            if questions_answered < min_questions:
-                # Progress based on questions answered towards minimum
-                return (
-                    questions_answered / min_questions
-                ) * 50  # 50% for reaching min questions
+    def _accuracy_progress(
+        self,
+        requirement: Dict[str, Any],
+        user_stats: Dict[str, Any],
+        user_profile: Dict[str, Any],
+    ) -> float:
+        """Progress towards an accuracy achievement."""
+        req_value = requirement.get("value", 1)
+        accuracy = user_stats.get("accuracy_percentage", 0)
+        min_questions = requirement.get("min_questions", 1)
+        questions_answered = user_profile.get("questions_answered", 0)
+
+        if questions_answered < min_questions:
+            # Progress based on questions answered towards minimum
+            return (
+                questions_answered / min_questions
+            ) * 50  # 50% for reaching min questions
+        else:
+            # Progress based on accuracy
+            if accuracy >= req_value:
+                return 100
             else:
-                # Progress based on accuracy
-                if accuracy >= req_value:
-                    return 100
-                else:
-                    return 50 + (
-                        (accuracy / req_value) * 50
-                    )  # 50-100% based on accuracy
-
-        elif req_type == "daily_streak":
-            # This would need to be calculated based on play history
-            # For now, return 0 as it requires more complex tracking
-            return 0
+                return 50 + ((accuracy / req_value) * 50)  # 50-100% based on accuracy
 
+    def _no_progress(
+        self,
+        requirement: Dict[str, Any],
+        user_stats: Dict[str, Any],
+        user_profile: Dict[str, Any],
+    ) -> float:
+        """Progress for requirement types that cannot be measured here."""
+        # Daily streaks would need to be calculated based on play history,
+        # which requires more complex tracking than the stats dict provides
         return 0
 
     def get_next_milestone_suggestion(
@@ -313,32 +375,44 @@ class ScoringEngine:
         suggestions = []
 
         # Streak-based suggestions
-        if current_streak < 5:
+        milestone = self._next_milestone(self._streak_milestones, current_streak)
+        if milestone:
+            value, name = milestone
             suggestions.append(
-                f"Reach a {5 - current_streak} more correct answers for Hot Streak achievement!"
-            )
-        elif current_streak < 10:
-            suggestions.append(
-                f"Just {10 - current_streak} more correct answers for Galaxy Expert achievement!"
+                f"Just {value - current_streak} more correct answers for {name} achievement!"
             )
 
         # Total correct suggestions
-        if questions_correct < 100:
-            remaining = 100 - questions_correct
+        milestone = self._next_milestone(
+            self._total_correct_milestones, questions_correct
+        )
+        if milestone:
+            value, name = milestone
+            remaining = value - questions_correct
             if remaining <= 20:
                 suggestions.append(
-                    f"Only {remaining} more correct answers for Trivia Master achievement!"
+                    f"Only {remaining} more correct answers for {name} achievement!"
                 )
 
         # Accuracy suggestions
-        if accuracy < 90 and user_profile.get("questions_answered", 0) >= 20:
+        milestone = self._next_milestone(self._accuracy_milestones, accuracy)
+        if milestone and user_profile.get("questions_answered", 0) >= 20:
+            value, name = milestone
             suggestions.append(
-                f"Improve accuracy to 90% for Perfectionist achievement (currently {accuracy:.1f}%)"
+                f"Improve accuracy to {value}% for {name} achievement (currently {accuracy:.1f}%)"
             )
 
         # Return the most achievable suggestion
         return suggestions[0] if suggestions else None
 
+    @staticmethod
+    def _next_milestone(
+        milestones: Tuple[Tuple[int, str], ...], current: float
+    ) -> Optional[Tuple[int, str]]:
+        """Return the lowest (value, name) milestone above the current value."""
+        index = bisect_right(milestones, current, key=itemgetter(0))
+        return milestones[index] if index < len(milestones) else None
+
     def calculate_weekly_performance_summary(
         self, weekly_stats: Dict[str, Any]
     ) -> Dict[str, Any]:
@@ -3,15 +3,166 @@ User management and statistics system for the Enhanced Trivia System.
 Handles user profile creation, statistics tracking, and personalization features.
 """
 
+import asyncio
+import heapq
 import logging
 from datetime import datetime, date, timedelta
+from operator import itemgetter
 from typing import Optional, Dict, Any, List, Tuple
 from utils.database import db_manager
-from utils.models import UserProfile, UserStats, POINT_VALUES
+from utils.leaderboard_manager import leaderboard_manager
+from utils.models import POINT_VALUES, USER_PROFILE_COLUMNS, UserProfile, UserStats
 import aiosqlite
 
 logger = logging.getLogger(__name__)
 
+# Fixed user queries, kept as module constants so every call sends the
+# identical SQL text and hits the connection's prepared-statement cache
+_SQL_SELECT_USER = f"SELECT {USER_PROFILE_COLUMNS} FROM users WHERE user_id = ?"
+
+_SQL_INSERT_USER = """
+    INSERT INTO users (user_id, created_at)
+    VALUES (?, ?)
+"""
+
+# Create the user on first answer, otherwise apply the answer to the stored
+# row; excluded.questions_correct is 1 for a correct answer, which drives the
+# streak columns
+_SQL_UPDATE_STATS = f"""
+    INSERT INTO users (
+        user_id, total_points, questions_answered, questions_correct,
+        current_streak, best_streak, last_played,
+        preferred_difficulty, created_at, recent_mask
+    )
+    VALUES (?, ?, 1, ?, ?, ?, ?, ?, ?, 2 | ?)
+    ON CONFLICT (user_id) DO UPDATE SET
+        total_points = total_points + excluded.total_points,
+        questions_answered = questions_answered + 1,
+        questions_correct = questions_correct
+            + excluded.questions_correct,
+        current_streak = CASE
+            WHEN excluded.questions_correct = 1
+            THEN current_streak + 1
+            ELSE 0
+        END,
+        best_streak = CASE
+            WHEN excluded.questions_correct = 1
+            THEN MAX(best_streak, current_streak + 1)
+            ELSE best_streak
+        END,
+        last_played = excluded.last_played,
+        preferred_difficulty = excluded.preferred_difficulty,
+        recent_mask = CASE
+            WHEN recent_mask >= 1024
+            THEN 1024 | (((recent_mask << 1) | excluded.questions_correct) & 1023)
+            ELSE (recent_mask << 1) | excluded.questions_correct
+        END
+    RETURNING {USER_PROFILE_COLUMNS}
+"""
+
+_SQL_UPDATE_CATEGORY_STATS = """
+    INSERT INTO user_category_stats (
+        user_id, category, difficulty, answered, correct, points
+    )
+    VALUES (?, ?, ?, 1, ?, ?)
+    ON CONFLICT (user_id, category, difficulty) DO UPDATE SET
+        answered = answered + 1,
+        correct = correct + excluded.correct,
+        points = points + excluded.points
+"""
+
+_SQL_POINTS_PER_CATEGORY = """
+    SELECT category, SUM(points) as points
+    FROM user_category_stats
+    WHERE user_id = ?
+    GROUP BY category
+    HAVING SUM(correct) > 0
+"""
+
+_SQL_DIFFICULTY_BREAKDOWN = """
+    SELECT difficulty, SUM(answered), SUM(correct), SUM(points)
+    FROM user_category_stats
+    WHERE user_id = ?
+    GROUP BY difficulty
+"""
+
+# Last 10 answers as users.recent_mask bits, see _SQL_UPDATE_STATS
+_SQL_RECENT_PERFORMANCE = "SELECT recent_mask FROM users WHERE user_id = ?"
+
+_SQL_ACHIEVEMENTS_COUNT = "SELECT COUNT(*) FROM user_achievements WHERE user_id = ?"
+
+_SQL_USER_RANK = """
+    SELECT rank FROM (
+        SELECT user_id,
+               ROW_NUMBER() OVER (ORDER BY total_points DESC) as rank
+        FROM users
+        WHERE total_points > 0
+    ) ranked_users
+    WHERE user_id = ?
+"""
+
+# Creates the user if needed; excluded.current_streak is 1 for a correct
+# answer and 0 otherwise
+_SQL_UPDATE_STREAK = """
+    INSERT INTO users (user_id, current_streak, best_streak, created_at)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT (user_id) DO UPDATE SET
+        current_streak = CASE
+            WHEN excluded.current_streak = 1
+            THEN current_streak + 1
+            ELSE 0
+        END,
+        best_streak = CASE
+            WHEN excluded.current_streak = 1
+            THEN MAX(best_streak, current_streak + 1)
+            ELSE best_streak
+        END
+    RETURNING current_streak
+"""
+
+_SQL_RESET_USER = """
+    UPDATE users SET
+        total_points = 0,
+        questions_answered = 0,
+        questions_correct = 0,
+        current_streak = 0,
+        best_streak = 0,
+        daily_challenge_completed = NULL,
+        weekly_challenge_completed = NULL,
+        recent_mask = 1
+    WHERE user_id = ?
+"""
+
+_SQL_DELETE_ACHIEVEMENTS = "DELETE FROM user_achievements WHERE user_id = ?"
+_SQL_DELETE_CATEGORY_STATS = "DELETE FROM user_category_stats WHERE user_id = ?"
+_SQL_DELETE_GAME_SESSIONS = "DELETE FROM game_sessions WHERE user_id = ?"
+
+# Difficulty suggested after a wrong answer at the given difficulty
+_EASIER_DIFFICULTY = {"hard": "medium", "medium": "easy", "easy": "easy"}
+
+# Challenge type -> completion column
+_CHALLENGE_COLUMNS = {
+    "daily": "daily_challenge_completed",
+    "weekly": "weekly_challenge_completed",
+}
+
+# Creates the user if needed; availability checks no longer do
+_SQL_COMPLETE_CHALLENGE = {
+    challenge_type: f"""
+    INSERT INTO users (user_id, {column}, created_at)
+    VALUES (?, ?, ?)
+    ON CONFLICT (user_id) DO UPDATE SET {column} = excluded.{column}
+"""
+    for challenge_type, column in _CHALLENGE_COLUMNS.items()
+}
+
+# A daily challenge completed today, or a weekly one completed on or after
+# this week's Monday, blocks another attempt
+_SQL_CHALLENGE_COMPLETED = {
+    "daily": "SELECT 1 FROM users WHERE user_id = ? AND daily_challenge_completed = ?",
+    "weekly": "SELECT 1 FROM users WHERE user_id = ? AND weekly_challenge_completed >= ?",
+}
+
 
 class UserManager:
     """Manages user profiles, statistics, and personalization features."""
@@ -23,43 +174,35 @@ class UserManager:
         """Get existing user profile or create a new one."""
         try:
             async with self.db_manager.get_connection() as conn:
-                # Try to get existing user
-                cursor = await conn.execute(
-                    """
-                    SELECT user_id, total_points, questions_answered, questions_correct,
-                           current_streak, best_streak, last_played, daily_challenge_completed,
-                           weekly_challenge_completed, preferred_difficulty, created_at
-                    FROM users WHERE user_id = ?
-                    """,
-                    (user_id,),
-                )
-
-                row = await cursor.fetchone()
-
-                if row:
-                    # Convert row to UserProfile
-                    return self._row_to_user_profile(row)
-                else:
-                    # Create new user
-                    return await self._create_new_user(conn, user_id)
+                return await self._get_or_create_user(conn, user_id)
 
         except Exception as e:
             logger.error(f"Error getting/creating user {user_id}: {e}")
             raise
 
+    async def _get_or_create_user(
+        self, conn: aiosqlite.Connection, user_id: int
+    ) -> UserProfile:
+        """Get or create a user profile on an already open connection."""
+        # Try to get existing user
+        cursor = await conn.execute(_SQL_SELECT_USER, (user_id,))
+
+        row = await cursor.fetchone()
+
+        if row:
+            # Convert row to UserProfile
+            return self._row_to_user_profile(row)
+        else:
+            # Create new user
+            return await self._create_new_user(conn, user_id)
+
     async def _create_new_user(
         self, conn: aiosqlite.Connection, user_id: int
     ) -> UserProfile:
         """Create a new user profile in the database."""
         now = datetime.now()
 
-        await conn.execute(
-            """
-            INSERT INTO users (user_id, created_at)
-            VALUES (?, ?)
-            """,
-            (user_id, now),
-        )
+        await conn.execute(_SQL_INSERT_USER, (user_id, now))
         await conn.commit()
 
         logger.info(f"Created new user profile for user {user_id}")
@@ -68,19 +211,7 @@ class UserManager:
 
     def _row_to_user_profile(self, row: tuple) -> UserProfile:
         """Convert database row to UserProfile object."""
-        return UserProfile(
-            user_id=row[0],
-            total_points=row[1] or 0,
-            questions_answered=row[2] or 0,
-            questions_correct=row[3] or 0,
-            current_streak=row[4] or 0,
-            best_streak=row[5] or 0,
-            last_played=datetime.fromisoformat(row[6]) if row[6] else None,
-            daily_challenge_completed=date.fromisoformat(row[7]) if row[7] else None,
-            weekly_challenge_completed=date.fromisoformat(row[8]) if row[8] else None,
-            preferred_difficulty=row[9],
-            created_at=datetime.fromisoformat(row[10]) if row[10] else None,
-        )
+        return UserProfile.from_row(row)
 
     async def update_stats(
         self,
@@ -88,134 +219,102 @@ class UserManager:
         points: int,
         is_correct: bool,
         difficulty: str,
-        category: str = "general",
+        category: Optional[str] = None,
     ) -> UserProfile:
         """Update user statistics after answering a question."""
         try:
             async with self.db_manager.get_connection() as conn:
-                # Get current user data
-                user = await self.get_or_create_user(user_id)
-
-                # Update basic stats
-                new_total_points = user.total_points + points
-                new_questions_answered = user.questions_answered + 1
-                new_questions_correct = user.questions_correct + (
-                    1 if is_correct else 0
-                )
-
-                # Update streak
-                if is_correct:
-                    new_current_streak = user.current_streak + 1
-                    new_best_streak = max(user.best_streak, new_current_streak)
-                else:
-                    new_current_streak = 0
-                    new_best_streak = user.best_streak
-
-                # Update last played
                 now = datetime.now()
+                correct = 1 if is_correct else 0
 
                 # Update preferred difficulty based on recent performance
-                new_preferred_difficulty = await self._calculate_preferred_difficulty(
-                    conn, user_id, difficulty, is_correct
+                new_preferred_difficulty = self._calculate_preferred_difficulty(
+                    difficulty, is_correct
                 )
 
-                # Update database
-                await conn.execute(
-                    """
-                    UPDATE users SET
-                        total_points = ?,
-                        questions_answered = ?,
-                        questions_correct = ?,
-                        current_streak = ?,
-                        best_streak = ?,
-                        last_played = ?,
-                        preferred_difficulty = ?
-                    WHERE user_id = ?
-                    """,
+                async with conn.execute(
+                    _SQL_UPDATE_STATS,
                     (
-                        new_total_points,
-                        new_questions_answered,
-                        new_questions_correct,
-                        new_current_streak,
-                        new_best_streak,
+                        user_id,
+                        points,
+                        correct,
+                        correct,
+                        correct,
                         now,
                         new_preferred_difficulty,
-                        user_id,
+                        now,
+                        correct,
                     ),
-                )
+                ) as cursor:
+                    row = await cursor.fetchone()
+
+                # Roll the answer into the per-category totals in the same
+                # transaction so the breakdowns never disagree with the profile.
+                # The totals count base question points, as the v6 backfill
+                # does, so challenge totals and answers without a question
+                # category are left out
+                base_points = POINT_VALUES.get(difficulty)
+                if category is not None and base_points is not None:
+                    await conn.execute(
+                        _SQL_UPDATE_CATEGORY_STATS,
+                        (user_id, category, difficulty, correct, base_points * correct),
+                    )
                 await conn.commit()
+                leaderboard_manager.invalidate()
 
                 logger.info(
                     f"Updated stats for user {user_id}: +{points} points, correct={is_correct}"
                 )
 
-                # Return updated user profile
-                user.total_points = new_total_points
-                user.questions_answered = new_questions_answered
-                user.questions_correct = new_questions_correct
-                user.current_streak = new_current_streak
-                user.best_streak = new_best_streak
-                user.last_played = now
-                user.preferred_difficulty = new_preferred_difficulty
-
-                return user
+                return self._row_to_user_profile(row)
 
         except Exception as e:
             logger.error(f"Error updating stats for user {user_id}: {e}")
             raise
 
-    async def _calculate_preferred_difficulty(
-        self,
-        conn: aiosqlite.Connection,
-        user_id: int,
-        current_difficulty: str,
-        is_correct: bool,
-    ) -> Optional[str]:
+    def _calculate_preferred_difficulty(
+        self, current_difficulty: str, is_correct: bool
+    ) -> str:
         """Calculate user's preferred difficulty based on recent performance."""
-        try:
-            # For now, return the current difficulty if correct, or suggest easier if incorrect
-            # This is a simplified version - a full implementation would track game history
-            if is_correct:
-                return current_difficulty
-            else:
-                # Suggest easier difficulty if they got it wrong
-                if current_difficulty == "hard":
-                    return "medium"
-                elif current_difficulty == "medium":
-                    return "easy"
-                else:
-                    return "easy"
-
-        except Exception as e:
-            logger.error(
-                f"Error calculating preferred difficulty for user {user_id}: {e}"
-            )
-            return None
+        # For now, return the current difficulty if correct, or suggest easier if incorrect
+        # This is a simplified version - a full implementation would track game history
+        if is_correct:
+            return current_difficulty
+        return _EASIER_DIFFICULTY.get(current_difficulty, "easy")
 
     async def get_user_stats(self, user_id: int) -> UserStats:
         """Get comprehensive user statistics."""
         try:
-            async with self.db_manager.get_connection() as conn:
-                # Get user profile
-                user_profile = await self.get_or_create_user(user_id)
-
-                # Get points per category
-                points_per_category = await self._get_points_per_category(conn, user_id)
-
-                # Get difficulty breakdown
-                difficulty_breakdown = await self._get_difficulty_breakdown(
-                    conn, user_id
+            async with (
+                self.db_manager.get_connection() as conn,
+                self.db_manager.get_connection() as breakdown_conn,
+            ):
+                # Profile, achievements, rank and recent answers read users and
+                # user_achievements, while the breakdowns read
+                # user_category_stats; run the two groups on separate pooled
+                # connections so they overlap
+                (
+                    (
+                        user_profile,
+                        achievements_count,
+                        current_rank,
+                        recent_performance,
+                    ),
+                    (points_per_category, difficulty_breakdown),
+                ) = await asyncio.gather(
+                    asyncio.gather(
+                        self._get_or_create_user(conn, user_id),
+                        self._get_achievements_count(conn, user_id),
+                        self._get_user_rank(conn, user_id),
+                        # Recent performance (last 10 answers)
+                        self._get_recent_performance(conn, user_id),
+                    ),
+                    asyncio.gather(
+                        self._get_points_per_category(breakdown_conn, user_id),
+                        self._get_difficulty_breakdown(breakdown_conn, user_id),
+                    ),
                 )
 
-                # Get recent performance (last 10 answers)
-                recent_performance = await self._get_recent_performance(conn, user_id)
-
-                # Get achievements count
-                achievements_count = await self._get_achievements_count(conn, user_id)
-
-                # Get current rank
-                current_rank = await self._get_user_rank(conn, user_id)
-
                 return UserStats(
                     user_profile=user_profile,
                     accuracy_percentage=user_profile.accuracy_percentage,
@@ -235,28 +334,7 @@ class UserManager:
     ) -> Dict[str, int]:
         """Get points earned per category."""
         try:
-            cursor = await conn.execute(
-                """
-                SELECT q.category, SUM(
-                    CASE 
-                        WHEN q.difficulty = 'easy' THEN 10
-                        WHEN q.difficulty = 'medium' THEN 20
-                        WHEN q.difficulty = 'hard' THEN 30
-                        ELSE 0
-                    END
-                ) as points
-                FROM game_sessions gs
-                JOIN questions q ON gs.question_id = q.id
-                WHERE gs.user_id = ? AND gs.is_completed = 1
-                  AND EXISTS (
-                      SELECT 1 FROM users u 
-                      WHERE u.user_id = gs.user_id 
-                      AND gs.end_time <= u.last_played
-                  )
-                GROUP BY q.category
-                """,
-                (user_id,),
-            )
+            cursor = await conn.execute(_SQL_POINTS_PER_CATEGORY, (user_id,))
 
             rows = await cursor.fetchall()
             return {category: points for category, points in rows}
@@ -270,36 +348,17 @@ class UserManager:
     ) -> Dict[str, Dict[str, int]]:
         """Get performance breakdown by difficulty."""
         try:
-            cursor = await conn.execute(
-                """
-                SELECT q.difficulty,
-                       COUNT(*) as total,
-                       SUM(CASE WHEN gs.is_completed = 1 THEN 1 ELSE 0 END) as completed,
-                       SUM(
-                           CASE 
-                               WHEN q.difficulty = 'easy' AND gs.is_completed = 1 THEN 10
-                               WHEN q.difficulty = 'medium' AND gs.is_completed = 1 THEN 20
-                               WHEN q.difficulty = 'hard' AND gs.is_completed = 1 THEN 30
-                               ELSE 0
-                           END
-                       ) as points
-                FROM game_sessions gs
-                JOIN questions q ON gs.question_id = q.id
-                WHERE gs.user_id = ?
-                GROUP BY q.difficulty
-                """,
-                (user_id,),
-            )
+            cursor = await conn.execute(_SQL_DIFFICULTY_BREAKDOWN, (user_id,))
 
             rows = await cursor.fetchall()
             breakdown = {}
 
-            for difficulty, total, completed, points in rows:
+            for difficulty, total, correct, points in rows:
                 breakdown[difficulty] = {
                     "total": total,
-                    "correct": completed,
+                    "correct": correct,
                     "points": points,
-                    "accuracy": (completed / total * 100) if total > 0 else 0,
+                    "accuracy": (correct / total * 100) if total > 0 else 0,
                 }
 
             return breakdown
@@ -313,19 +372,15 @@ class UserManager:
     ) -> List[bool]:
         """Get recent performance (last 10 answers)."""
         try:
-            cursor = await conn.execute(
-                """
-                SELECT is_completed
-                FROM game_sessions
-                WHERE user_id = ? AND question_id IS NOT NULL
-                ORDER BY end_time DESC
-                LIMIT 10
-                """,
-                (user_id,),
-            )
+            cursor = await conn.execute(_SQL_RECENT_PERFORMANCE, (user_id,))
 
-            rows = await cursor.fetchall()
-            return [bool(row[0]) for row in rows]
+            row = await cursor.fetchone()
+            if not row:
+                return []
+
+            # Bits below the marker bit are the answers, newest first
+            mask = row[0]
+            return [bool(mask >> i & 1) for i in range(mask.bit_length() - 1)]
 
         except Exception as e:
             logger.error(f"Error getting recent performance for user {user_id}: {e}")
@@ -336,9 +391,7 @@ class UserManager:
     ) -> int:
         """Get total number of achievements earned."""
         try:
-            cursor = await conn.execute(
-                "SELECT COUNT(*) FROM user_achievements WHERE user_id = ?", (user_id,)
-            )
+            cursor = await conn.execute(_SQL_ACHIEVEMENTS_COUNT, (user_id,))
 
             result = await cursor.fetchone()
             return result[0] if result else 0
@@ -352,18 +405,7 @@ class UserManager:
     ) -> Optional[int]:
         """Get user's current rank in the leaderboard."""
         try:
-            cursor = await conn.execute(
-                """
-                SELECT rank FROM (
-                    SELECT user_id, 
-                           ROW_NUMBER() OVER (ORDER BY total_points DESC) as rank
-                    FROM users
-                    WHERE total_points > 0
-                ) ranked_users
-                WHERE user_id = ?
-                """,
-                (user_id,),
-            )
+            cursor = await conn.execute(_SQL_USER_RANK, (user_id,))
 
             result = await cursor.fetchone()
             return result[0] if result else None
@@ -375,29 +417,17 @@ class UserManager:
     async def update_streak(self, user_id: int, is_correct: bool) -> int:
         """Update user's streak and return new streak value."""
         try:
-            user = await self.get_or_create_user(user_id)
-
-            if is_correct:
-                new_streak = user.current_streak + 1
-            else:
-                new_streak = 0
+            correct = 1 if is_correct else 0
 
             async with self.db_manager.get_connection() as conn:
-                await conn.execute(
-                    """
-                    UPDATE users SET 
-                        current_streak = ?,
-                        best_streak = CASE 
-                            WHEN ? > best_streak THEN ?
-                            ELSE best_streak
-                        END
-                    WHERE user_id = ?
-                    """,
-                    (new_streak, new_streak, new_streak, user_id),
-                )
+                async with conn.execute(
+                    _SQL_UPDATE_STREAK,
+                    (user_id, correct, correct, datetime.now()),
+                ) as cursor:
+                    row = await cursor.fetchone()
                 await conn.commit()
 
-            return new_streak
+            return row[0]
 
         except Exception as e:
             logger.error(f"Error updating streak for user {user_id}: {e}")
@@ -416,33 +446,24 @@ class UserManager:
         """Reset user's statistics (admin function)."""
         try:
             async with self.db_manager.get_connection() as conn:
+                # Take the write lock up front so the reset cannot fail part way
+                # through on a lock upgrade; all four writes commit together
+                await conn.execute("BEGIN IMMEDIATE")
+
                 # Reset user stats but keep profile
-                await conn.execute(
-                    """
-                    UPDATE users SET
-                        total_points = 0,
-                        questions_answered = 0,
-                        questions_correct = 0,
-                        current_streak = 0,
-                        best_streak = 0,
-                        daily_challenge_completed = NULL,
-                        weekly_challenge_completed = NULL
-                    WHERE user_id = ?
-                    """,
-                    (user_id,),
-                )
+                await conn.execute(_SQL_RESET_USER, (user_id,))
 
                 # Remove achievements
-                await conn.execute(
-                    "DELETE FROM user_achievements WHERE user_id = ?", (user_id,)
-                )
+                await conn.execute(_SQL_DELETE_ACHIEVEMENTS, (user_id,))
+
+                # Remove per-category totals
+                await conn.execute(_SQL_DELETE_CATEGORY_STATS, (user_id,))
 
                 # Remove game sessions
-                await conn.execute(
-                    "DELETE FROM game_sessions WHERE user_id = ?", (user_id,)
-                )
+                await conn.execute(_SQL_DELETE_GAME_SESSIONS, (user_id,))
 
                 await conn.commit()
+                leaderboard_manager.invalidate()
                 logger.info(f"Reset stats for user {user_id}")
                 return True
 
@@ -455,21 +476,12 @@ class UserManager:
     ) -> bool:
         """Update challenge completion status."""
         try:
-            async with self.db_manager.get_connection() as conn:
-                today = date.today()
+            sql = _SQL_COMPLETE_CHALLENGE.get(challenge_type)
+            if sql is None:
+                return False
 
-                if challenge_type == "daily":
-                    await conn.execute(
-                        "UPDATE users SET daily_challenge_completed = ? WHERE user_id = ?",
-                        (today, user_id),
-                    )
-                elif challenge_type == "weekly":
-                    await conn.execute(
-                        "UPDATE users SET weekly_challenge_completed = ? WHERE user_id = ?",
-                        (today, user_id),
-                    )
-                else:
-                    return False
+            async with self.db_manager.get_connection() as conn:
+                await conn.execute(sql, (user_id, date.today(), datetime.now()))
 
                 await conn.commit()
                 return True
@@ -481,30 +493,20 @@ class UserManager:
     async def can_attempt_challenge(self, user_id: int, challenge_type: str) -> bool:
         """Check if user can attempt a challenge."""
         try:
-            user = await self.get_or_create_user(user_id)
             today = date.today()
 
             if challenge_type == "daily":
-                return user.daily_challenge_completed != today
+                cutoff = today
             elif challenge_type == "weekly":
-                # Check if it's a new week (Monday start)
-                if user.weekly_challenge_completed is None:
-                    return True
-
-                # Get the Monday of current week
-                days_since_monday = today.weekday()
-                current_week_start = today - timedelta(days=days_since_monday)
-
-                # Get the Monday of the week when challenge was completed
-                completed_date = user.weekly_challenge_completed
-                completed_days_since_monday = completed_date.weekday()
-                completed_week_start = completed_date - timedelta(
-                    days=completed_days_since_monday
-                )
-
-                return current_week_start > completed_week_start
+                cutoff = today - timedelta(days=today.weekday())
+            else:
+                return False
 
-            return False
+            async with self.db_manager.get_connection() as conn:
+                cursor = await conn.execute(
+                    _SQL_CHALLENGE_COMPLETED[challenge_type], (user_id, cutoff)
+                )
+                return await cursor.fetchone() is None
 
         except Exception as e:
             logger.error(
@@ -515,8 +517,8 @@ class UserManager:
     async def get_user_preferences(self, user_id: int) -> Dict[str, Any]:
         """Get user preferences and personalization data."""
         try:
-            user = await self.get_or_create_user(user_id)
             stats = await self.get_user_stats(user_id)
+            user = stats.user_profile
 
             # Analyze weak areas (categories with low accuracy)
             weak_areas = []
@@ -572,11 +574,11 @@ class UserManager:
         if not points_per_category:
             return []
 
-        # Sort categories by points and return top 3
-        sorted_categories = sorted(
-            points_per_category.items(), key=lambda x: x[1], reverse=True
+        # Top 3 categories by points, without sorting the rest
+        top_categories = heapq.nlargest(
+            3, points_per_category.items(), key=itemgetter(1)
         )
-        return [category for category, _ in sorted_categories[:3]]
+        return [category for category, _ in top_categories]
 
 
 # Global user manager instance